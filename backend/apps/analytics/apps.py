@@ -4,3 +4,6 @@ class AnalyticsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.analytics'
     label = 'analytics'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyUserStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('date', models.DateField()),
+                ('tasks_completed', models.IntegerField(default=0)),
+                ('tasks_created', models.IntegerField(default=0)),
+                ('focus_seconds', models.IntegerField(default=0)),
+                ('focus_sessions', models.IntegerField(default=0)),
+                ('completed_p1', models.IntegerField(default=0)),
+                ('completed_p2', models.IntegerField(default=0)),
+                ('completed_p3', models.IntegerField(default=0)),
+                ('completed_p4', models.IntegerField(default=0)),
+                ('completed_low_energy', models.IntegerField(default=0)),
+                ('completed_medium_energy', models.IntegerField(default=0)),
+                ('completed_high_energy', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'daily_user_stats',
+                'ordering': ['date'],
+                'unique_together': {('user', 'date')},
+            },
+        ),
+    ]
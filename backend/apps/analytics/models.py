@@ -0,0 +1,28 @@
+from django.db import models
+from django.conf import settings
+from common.models import BaseModel
+
+
+class DailyUserStats(BaseModel):
+    """Per-user, per-day activity rollup backing the dashboard endpoints."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    tasks_completed = models.IntegerField(default=0)
+    tasks_created = models.IntegerField(default=0)
+    focus_seconds = models.IntegerField(default=0)
+    focus_sessions = models.IntegerField(default=0)
+    completed_p1 = models.IntegerField(default=0)
+    completed_p2 = models.IntegerField(default=0)
+    completed_p3 = models.IntegerField(default=0)
+    completed_p4 = models.IntegerField(default=0)
+    completed_low_energy = models.IntegerField(default=0)
+    completed_medium_energy = models.IntegerField(default=0)
+    completed_high_energy = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'daily_user_stats'
+        ordering = ['date']
+        unique_together = ['user', 'date']
+
+    def __str__(self):
+        return f"{self.user_id} - {self.date}"
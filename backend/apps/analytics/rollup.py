@@ -0,0 +1,133 @@
+"""
+Maintenance of the ``DailyUserStats`` rollup.
+
+A rollup row always equals the aggregate of the current ``tasks`` and
+``focus_sessions`` rows for that user and day, so refreshing a day is
+idempotent: signal handlers refresh the days an edit touched and the Celery
+repair task can rebuild any window without double counting.
+
+Days are the user's local calendar days (``User.timezone``). A rebuild runs
+its grouped queries once per distinct timezone among the users it covers,
+truncating in SQL with that zone.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Min, Q, Sum
+from django.utils import timezone
+
+from apps.tasks.models import Task
+from apps.focus.models import FocusSession
+from common.dates import day_bounds, day_trunc, get_zone, local_date
+from .models import DailyUserStats
+
+STAT_FIELDS = [
+    'tasks_completed', 'tasks_created', 'focus_seconds', 'focus_sessions',
+    'completed_p1', 'completed_p2', 'completed_p3', 'completed_p4',
+    'completed_low_energy', 'completed_medium_energy', 'completed_high_energy',
+]
+
+BATCH_SIZE = 500
+
+
+def _zones(user_id=None):
+    """``(zone, scope)`` pairs covering the users to rebuild, one per distinct timezone."""
+    users = get_user_model().objects.order_by()
+    if user_id:
+        name = users.filter(pk=user_id).values_list('timezone', flat=True).first()
+        return [(get_zone(name), {'user_id': user_id})]
+    names = users.values_list('timezone', flat=True).distinct()
+    return [(get_zone(name), {'user__timezone': name}) for name in names]
+
+
+def _by_user_day(queryset, field, tz, **aggregates):
+    rows = (
+        queryset
+        .annotate(day=day_trunc(field, tz))
+        .values('user_id', 'day')
+        .annotate(**aggregates)
+        .order_by()
+    )
+    return {(row.pop('user_id'), row.pop('day')): row for row in rows}
+
+
+def rebuild(start, end, user_id=None):
+    """
+    Recompute rollup rows for every day in ``start``..``end``.
+
+    Per timezone, runs three grouped queries over the raw tables plus one
+    query for the rows already stored in the window (so days whose activity
+    disappeared are reset to zero), then upserts in batches. Returns the
+    number of rows written.
+    """
+    return sum(_rebuild_zone(start, end, tz, scope) for tz, scope in _zones(user_id))
+
+
+def _rebuild_zone(start, end, tz, scope):
+    lower, upper = day_bounds(start, end, tz)
+
+    completed = _by_user_day(
+        Task.objects.filter(status='done', completed_at__gte=lower, completed_at__lt=upper, **scope),
+        'completed_at', tz,
+        tasks_completed=Count('id'),
+        completed_p1=Count('id', filter=Q(priority='P1')),
+        completed_p2=Count('id', filter=Q(priority='P2')),
+        completed_p3=Count('id', filter=Q(priority='P3')),
+        completed_p4=Count('id', filter=Q(priority='P4')),
+        completed_low_energy=Count('id', filter=Q(energy_level='low')),
+        completed_medium_energy=Count('id', filter=Q(energy_level='medium')),
+        completed_high_energy=Count('id', filter=Q(energy_level='high')),
+    )
+    created = _by_user_day(
+        Task.objects.filter(created_at__gte=lower, created_at__lt=upper, **scope),
+        'created_at', tz,
+        tasks_created=Count('id'),
+    )
+    focus = _by_user_day(
+        FocusSession.objects.filter(
+            is_completed=True, started_at__gte=lower, started_at__lt=upper, **scope,
+        ),
+        'started_at', tz,
+        focus_seconds=Sum('duration_seconds'),
+        focus_sessions=Count('id'),
+    )
+    existing = DailyUserStats.objects.filter(date__range=[start, end], **scope).values_list('user_id', 'date')
+
+    keys = set(completed) | set(created) | set(focus) | set(existing)
+    rows = []
+    for key in keys:
+        values = dict.fromkeys(STAT_FIELDS, 0)
+        for source in (completed, created, focus):
+            values.update({k: v or 0 for k, v in source.get(key, {}).items()})
+        rows.append(DailyUserStats(user_id=key[0], date=key[1], **values))
+
+    DailyUserStats.objects.bulk_create(
+        rows,
+        batch_size=BATCH_SIZE,
+        update_conflicts=True,
+        unique_fields=['user', 'date'],
+        update_fields=STAT_FIELDS + ['updated_at'],
+    )
+    return len(rows)
+
+
+def refresh_moments(user_id, moments):
+    """Recompute the rollup rows of one user for the local days containing ``moments``."""
+    [(tz, scope)] = _zones(user_id)
+    for day in sorted({local_date(m, tz) for m in moments if m is not None}):
+        _rebuild_zone(day, day, tz, scope)
+
+
+def rebuild_history(user_id=None):
+    """Rebuild every day from the earliest recorded activity up to today."""
+    scope = {'user_id': user_id} if user_id else {}
+    firsts = [
+        Task.objects.filter(**scope).aggregate(first=Min('created_at'))['first'],
+        FocusSession.objects.filter(**scope).aggregate(first=Min('started_at'))['first'],
+    ]
+    firsts = [f for f in firsts if f is not None]
+    if not firsts:
+        return 0
+    # UTC dates, widened by a day each way to cover every user's local days.
+    start = min(firsts).date() - timedelta(days=1)
+    return rebuild(start, timezone.now().date() + timedelta(days=1), user_id=user_id)
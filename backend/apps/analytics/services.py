@@ -0,0 +1,152 @@
+"""
+Analytics computations shared by the dashboard views.
+
+Every series is produced from a constant number of queries — range scans
+over the ``DailyUserStats`` rollup, or grouped aggregations where the rollup
+does not apply (e.g. per-project burndown). Gaps between buckets are filled
+in Python so the chart always gets a contiguous axis regardless of how many
+days have no activity.
+"""
+from datetime import timedelta
+
+from django.db.models import Count, Q, Sum
+
+from common.dates import day_bounds, day_trunc
+from .models import DailyUserStats
+
+GRANULARITIES = ('day', 'week', 'month')
+
+
+def bucket_start(day, granularity):
+    """Return the first date of the bucket that ``day`` falls into."""
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day, granularity):
+    """Return the first date of the bucket following the one starting at ``day``."""
+    if granularity == 'week':
+        return day + timedelta(days=7)
+    if granularity == 'month':
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def iter_buckets(start, end, granularity):
+    """Yield bucket start dates covering ``start``..``end`` (inclusive)."""
+    current = bucket_start(start, granularity)
+    while current <= end:
+        yield current
+        current = next_bucket(current, granularity)
+
+
+def _grouped(queryset, field, granularity, value, tz):
+    """Run one grouped aggregation of ``value`` per local ``granularity`` bucket of ``field``."""
+    rows = (
+        queryset
+        .annotate(bucket=day_trunc(field, tz, granularity))
+        .values('bucket')
+        .annotate(value=value)
+        .order_by()
+    )
+    return {row['bucket']: row['value'] or 0 for row in rows}
+
+
+def compute_trends(user, start, end, granularity='day'):
+    """
+    Completed/created task counts and focus minutes per bucket.
+
+    Reads the user's ``DailyUserStats`` rows for the window in one indexed
+    range scan and folds them into ``granularity`` buckets.
+    """
+    start = bucket_start(start, granularity)
+    rows = (
+        DailyUserStats.objects
+        .filter(user=user, date__range=[start, end])
+        .values_list('date', 'tasks_completed', 'tasks_created', 'focus_seconds')
+    )
+
+    totals = {}
+    for day, completed, created, focus_seconds in rows:
+        bucket = totals.setdefault(bucket_start(day, granularity), [0, 0, 0])
+        bucket[0] += completed
+        bucket[1] += created
+        bucket[2] += focus_seconds
+
+    trends = []
+    for bucket in iter_buckets(start, end, granularity):
+        completed, created, focus_seconds = totals.get(bucket, (0, 0, 0))
+        trends.append({
+            'date': str(bucket),
+            'completed': completed,
+            'created': created,
+            'focus_minutes': focus_seconds // 60,
+        })
+    return trends
+
+
+def _running_totals(start, end, scope, done, created, completed):
+    burndown = []
+    for day in iter_buckets(start, end, 'day'):
+        scope += created.get(day, 0)
+        done += completed.get(day, 0)
+        burndown.append({
+            'date': str(day),
+            'scope': scope,
+            'remaining': scope - done,
+            'completed': done,
+        })
+    return burndown
+
+
+def compute_burndown(tasks, start, end, tz):
+    """
+    Remaining/completed/scope per day for the ``tasks`` queryset.
+
+    The state before ``start`` is read with one conditional aggregate and the
+    window itself from two per-day histograms (tasks created, tasks completed);
+    running totals are then a prefix sum, so scope changes during the window
+    are reflected instead of assuming a constant total. Days are local to
+    ``tz``.
+    """
+    lower, upper = day_bounds(start, end, tz)
+
+    baseline = tasks.aggregate(
+        scope=Count('id', filter=Q(created_at__lt=lower)),
+        completed=Count('id', filter=Q(status='done', completed_at__lt=lower)),
+    )
+    created = _grouped(
+        tasks.filter(created_at__gte=lower, created_at__lt=upper),
+        'created_at', 'day', Count('id'), tz,
+    )
+    completed = _grouped(
+        tasks.filter(status='done', completed_at__gte=lower, completed_at__lt=upper),
+        'completed_at', 'day', Count('id'), tz,
+    )
+
+    return _running_totals(start, end, baseline['scope'], baseline['completed'], created, completed)
+
+
+def compute_user_burndown(user, start, end):
+    """
+    Burndown across all of a user's tasks, read from ``DailyUserStats``.
+
+    One aggregate over the rows before ``start`` gives the opening scope and
+    completed count; the window rows feed the same prefix sum.
+    """
+    stats = DailyUserStats.objects.filter(user=user)
+    baseline = stats.filter(date__lt=start).aggregate(
+        scope=Sum('tasks_created'), completed=Sum('tasks_completed'),
+    )
+    created, completed = {}, {}
+    for day, n_created, n_completed in (
+        stats.filter(date__range=[start, end]).values_list('date', 'tasks_created', 'tasks_completed')
+    ):
+        created[day] = n_created
+        completed[day] = n_completed
+    return _running_totals(
+        start, end, baseline['scope'] or 0, baseline['completed'] or 0, created, completed,
+    )
@@ -0,0 +1,149 @@
+"""
+Keep ``DailyUserStats`` current as tasks and focus sessions change, and
+invalidate the user's cached dashboard responses.
+
+Receivers record the instants an edit touched (creation, completion, session
+start); ``refresh_moments`` maps them to the user's local days on commit, so
+no receiver needs the user's timezone.
+"""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from apps.tasks.models import Project, Task
+from apps.focus.models import FocusSession
+from apps.habits.models import HabitState, HabitStreak
+from common.batching import defer, flusher
+from common.cache import bump_user_version
+from .rollup import rebuild_history, refresh_moments
+
+TASK_TRACKED_FIELDS = ('status', 'completed_at', 'priority', 'energy_level')
+SESSION_TRACKED_FIELDS = ('started_at', 'duration_seconds', 'is_completed')
+
+
+def _completed_at(task):
+    if task.status == 'done' and task.completed_at:
+        return task.completed_at
+    return None
+
+
+def _deleting_user(origin):
+    """True when a delete cascades from the user row: no rollup or cache left to keep."""
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model is get_user_model()
+
+
+def _schedule_refresh(user_id, moments):
+    moments = {m for m in moments if m is not None}
+    if moments and not defer('analytics.rollup', (user_id, moments)):
+        transaction.on_commit(lambda: refresh_moments(user_id, moments))
+
+
+@flusher('analytics.rollup')
+def _flush_refreshes(items):
+    by_user = {}
+    for user_id, moments in items:
+        by_user.setdefault(user_id, set()).update(moments)
+    for user_id, moments in by_user.items():
+        transaction.on_commit(lambda user_id=user_id, moments=moments: refresh_moments(user_id, moments))
+
+
+def _remember_previous(sender, instance, fields):
+    """Stash the stored values of ``fields`` so post_save can diff against them."""
+    instance._rollup_previous = None
+    if not instance._state.adding:
+        instance._rollup_previous = sender.objects.filter(pk=instance.pk).values(*fields).first()
+
+
+@receiver(pre_save, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    _remember_previous(sender, instance, TASK_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=Task)
+def refresh_task_stats(sender, instance, created, **kwargs):
+    if created:
+        _schedule_refresh(instance.user_id, [instance.created_at, _completed_at(instance)])
+        return
+
+    previous = getattr(instance, '_rollup_previous', None)
+    if previous is None:
+        return
+    if all(previous[f] == getattr(instance, f) for f in TASK_TRACKED_FIELDS):
+        return
+    old_completed_at = previous['completed_at'] if previous['status'] == 'done' else None
+    _schedule_refresh(instance.user_id, [old_completed_at, _completed_at(instance)])
+
+
+@receiver(post_delete, sender=Task)
+def refresh_deleted_task_stats(sender, instance, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    _schedule_refresh(instance.user_id, [instance.created_at, _completed_at(instance)])
+
+
+@receiver(pre_save, sender=FocusSession)
+def remember_session_state(sender, instance, **kwargs):
+    _remember_previous(sender, instance, SESSION_TRACKED_FIELDS)
+
+
+@receiver(post_save, sender=FocusSession)
+def refresh_session_stats(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_rollup_previous', None)
+    if not created and previous is not None:
+        if all(previous[f] == getattr(instance, f) for f in SESSION_TRACKED_FIELDS):
+            return
+        old_start = previous['started_at']
+    else:
+        old_start = None
+    if instance.is_completed or old_start:
+        _schedule_refresh(instance.user_id, [old_start, instance.started_at])
+
+
+@receiver(post_delete, sender=FocusSession)
+def refresh_deleted_session_stats(sender, instance, origin=None, **kwargs):
+    if instance.is_completed and not _deleting_user(origin):
+        _schedule_refresh(instance.user_id, [instance.started_at])
+
+
+@receiver(pre_save, sender=get_user_model())
+def remember_user_timezone(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'timezone' not in update_fields:
+        instance._rollup_previous = None  # e.g. the last_login update on every sign-in
+        return
+    _remember_previous(sender, instance, ('timezone',))
+
+
+@receiver(post_save, sender=get_user_model())
+def rebucket_on_timezone_change(sender, instance, created, **kwargs):
+    """Local days move with the timezone, so every rollup row is rebuilt."""
+    previous = getattr(instance, '_rollup_previous', None)
+    if created or previous is None or previous['timezone'] == instance.timezone:
+        return
+    user_id = instance.pk
+    transaction.on_commit(lambda: rebuild_history(user_id=user_id))
+    transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+# Registered after the rollup receivers, so on commit the version is bumped
+# only once ``DailyUserStats`` has been refreshed; a request in between can't
+# cache a stale rollup under the new version.
+def invalidate_user_responses(sender, instance, origin=None, **kwargs):
+    if _deleting_user(origin):
+        return
+    user_id = instance.user_id
+    if not defer('analytics.invalidate', user_id):
+        transaction.on_commit(lambda: bump_user_version(user_id))
+
+
+@flusher('analytics.invalidate')
+def _flush_invalidations(user_ids):
+    for user_id in set(user_ids):
+        transaction.on_commit(lambda user_id=user_id: bump_user_version(user_id))
+
+
+for _model in (Task, Project, FocusSession, HabitStreak, HabitState):
+    post_save.connect(invalidate_user_responses, sender=_model, dispatch_uid=f'invalidate-{_model.__name__}-save')
+    post_delete.connect(invalidate_user_responses, sender=_model, dispatch_uid=f'invalidate-{_model.__name__}-delete')
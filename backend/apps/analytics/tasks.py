@@ -0,0 +1,23 @@
+"""Celery tasks maintaining the analytics rollup."""
+from datetime import timedelta
+
+from celery import shared_task
+from django.utils import timezone
+
+
+@shared_task
+def rebuild_daily_stats(days=2, user_id=None):
+    """
+    Backfill or repair ``DailyUserStats``.
+
+    ``days`` limits the rebuild to the trailing window (the nightly repair
+    run); pass ``days=None`` to rebuild the full history, e.g. after deploying
+    the rollup table for the first time.
+    """
+    from .rollup import rebuild, rebuild_history
+
+    if days is None:
+        return rebuild_history(user_id=user_id)
+    # UTC today; one day ahead covers users east of UTC who are already there.
+    today = timezone.now().date()
+    return rebuild(today - timedelta(days=days - 1), today + timedelta(days=1), user_id=user_id)
@@ -1,117 +1,106 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
 from django.utils import timezone
-from django.db.models import Count, Q, Sum, F
+from django.db.models import Count, Q, Sum
 from datetime import timedelta
 
+from common.cache import cache_user_response
+from common.dates import user_today, user_zone
 from apps.tasks.models import Task
-from apps.focus.models import FocusSession
+from .models import DailyUserStats
+from .services import GRANULARITIES, compute_burndown, compute_trends, compute_user_burndown
 
 
 class OverviewView(APIView):
     """Dashboard overview stats."""
     permission_classes = [IsAuthenticated]
 
+    @cache_user_response()
     def get(self, request):
         user = request.user
         now = timezone.now()
-        today = now.date()
+        today = user_today(user, now)
 
-        total_tasks = Task.objects.filter(user=user).count()
-        completed = Task.objects.filter(user=user, status='done').count()
-        in_progress = Task.objects.filter(user=user, status='in_progress').count()
-        overdue = Task.objects.filter(
-            user=user, status__in=['todo', 'in_progress'], due_date__lt=now
-        ).count()
+        counts = Task.objects.filter(user=user).aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='done')),
+            in_progress=Count('id', filter=Q(status='in_progress')),
+            overdue=Count('id', filter=Q(status__in=['todo', 'in_progress'], due_date__lt=now)),
+        )
+        total_tasks = counts['total']
+        completed = counts['completed']
 
         completion_rate = round(completed / total_tasks * 100, 1) if total_tasks > 0 else 0
 
         # Today's stats
-        today_completed = Task.objects.filter(
-            user=user, status='done', completed_at__date=today
-        ).count()
-        today_focus_minutes = (FocusSession.objects.filter(
-            user=user, started_at__date=today, is_completed=True
-        ).aggregate(s=Sum('duration_seconds'))['s'] or 0) // 60
+        today_stats = DailyUserStats.objects.filter(user=user, date=today).values(
+            'tasks_completed', 'focus_seconds',
+        ).first() or {'tasks_completed': 0, 'focus_seconds': 0}
 
         return Response({
             'total_tasks': total_tasks,
             'completed': completed,
-            'in_progress': in_progress,
-            'overdue': overdue,
+            'in_progress': counts['in_progress'],
+            'overdue': counts['overdue'],
             'completion_rate': completion_rate,
-            'today_completed': today_completed,
-            'today_focus_minutes': today_focus_minutes,
+            'today_completed': today_stats['tasks_completed'],
+            'today_focus_minutes': today_stats['focus_seconds'] // 60,
         })
 
 
 class TrendsView(APIView):
-    """Daily/weekly productivity trends."""
+    """Daily/weekly/monthly productivity trends."""
     permission_classes = [IsAuthenticated]
+    max_days = 730
 
     def get(self, request):
-        user = request.user
-        days = int(request.query_params.get('days', 14))
-        today = timezone.now().date()
-
-        trends = []
-        for i in range(days):
-            date = today - timedelta(days=i)
-            completed = Task.objects.filter(
-                user=user, status='done', completed_at__date=date
-            ).count()
-            created = Task.objects.filter(
-                user=user, created_at__date=date
-            ).count()
-            focus_mins = (FocusSession.objects.filter(
-                user=user, started_at__date=date, is_completed=True
-            ).aggregate(s=Sum('duration_seconds'))['s'] or 0) // 60
-
-            trends.append({
-                'date': str(date),
-                'completed': completed,
-                'created': created,
-                'focus_minutes': focus_mins,
-            })
-
-        trends.reverse()
-        return Response(trends)
+        try:
+            days = int(request.query_params.get('days', 14))
+        except ValueError:
+            return Response({'detail': 'days must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        days = max(1, min(days, self.max_days))
+
+        granularity = request.query_params.get('granularity', 'day')
+        if granularity not in GRANULARITIES:
+            return Response(
+                {'detail': f"granularity must be one of: {', '.join(GRANULARITIES)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        today = user_today(request.user)
+        start = today - timedelta(days=days - 1)
+        return Response(compute_trends(request.user, start, today, granularity))
 
 
 class BurndownView(APIView):
     """Burn-down chart data for a project."""
     permission_classes = [IsAuthenticated]
+    max_days = 365
 
     def get(self, request):
         project_id = request.query_params.get('project')
-        days = int(request.query_params.get('days', 30))
-        today = timezone.now().date()
-
-        filters = {'user': request.user}
-        if project_id:
-            filters['project_id'] = project_id
+        try:
+            days = int(request.query_params.get('days', 30))
+        except ValueError:
+            return Response({'detail': 'days must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        days = max(1, min(days, self.max_days))
+        today = user_today(request.user)
 
-        total = Task.objects.filter(**filters).count()
-        burndown = []
-        for i in range(days):
-            date = today - timedelta(days=(days - 1 - i))
-            completed_by_date = Task.objects.filter(
-                **filters, status='done', completed_at__date__lte=date
-            ).count()
-            burndown.append({
-                'date': str(date),
-                'remaining': total - completed_by_date,
-                'completed': completed_by_date,
-            })
+        start = today - timedelta(days=days - 1)
+        if not project_id:
+            return Response(compute_user_burndown(request.user, start, today))
 
-        return Response(burndown)
+        tasks = Task.objects.filter(user=request.user, project_id=project_id)
+        return Response(compute_burndown(tasks, start, today, user_zone(request.user)))
 
 
 class TimeAllocationView(APIView):
     """Time allocation breakdown by project and energy level."""
     permission_classes = [IsAuthenticated]
 
+    @cache_user_response()
     def get(self, request):
         user = request.user
 
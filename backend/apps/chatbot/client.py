@@ -0,0 +1,84 @@
+"""
+Async client for Groq's OpenAI-compatible chat completions API.
+
+One pooled ``httpx.AsyncClient`` is kept per event loop (under Daphne that is
+one per process), so consecutive chat requests reuse warm TLS connections
+instead of handshaking on every message. This relies on the ASGI deployment:
+under WSGI each request runs on a new loop and gets a new client.
+"""
+import json
+import asyncio
+import weakref
+
+import httpx
+from django.conf import settings
+
+MODEL_PARAMS = {
+    "model": "llama-3.3-70b-versatile",
+    "temperature": 0.7,
+    "max_tokens": 500,
+}
+TIMEOUT = httpx.Timeout(30.0, connect=5.0)
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+_clients = weakref.WeakKeyDictionary()
+
+
+class GroqError(Exception):
+    """Upstream returned a non-200 response."""
+
+
+def get_client():
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(timeout=TIMEOUT, limits=LIMITS)
+        _clients[loop] = client
+    return client
+
+
+def _headers():
+    return {
+        "Authorization": f"Bearer {settings.GROQ_API_KEY}",
+        "Content-Type": "application/json",
+    }
+
+
+def _error_message(body):
+    try:
+        return json.loads(body).get('error', {}).get('message', 'Unknown error')
+    except (ValueError, AttributeError):
+        return 'Unknown error'
+
+
+async def complete(messages):
+    """Return the assistant reply for ``messages``."""
+    response = await get_client().post(
+        settings.GROQ_API_URL,
+        headers=_headers(),
+        json={**MODEL_PARAMS, "messages": messages},
+    )
+    if response.status_code != 200:
+        raise GroqError(_error_message(response.text))
+    return response.json()['choices'][0]['message']['content']
+
+
+async def stream(messages):
+    """Yield reply tokens for ``messages`` as Groq produces them."""
+    async with get_client().stream(
+        "POST",
+        settings.GROQ_API_URL,
+        headers=_headers(),
+        json={**MODEL_PARAMS, "messages": messages, "stream": True},
+    ) as response:
+        if response.status_code != 200:
+            raise GroqError(_error_message(await response.aread()))
+        async for line in response.aiter_lines():
+            if not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if data == '[DONE]':
+                break
+            delta = json.loads(data)['choices'][0].get('delta', {}).get('content')
+            if delta:
+                yield delta
@@ -0,0 +1,85 @@
+"""
+Compact snapshot of the user's current workload for the chatbot prompt.
+
+The snapshot is a few lines of text built from open tasks, due-soon items and
+focus totals. It is cached for ``CONTEXT_TTL`` seconds, so a conversation
+costs these queries once every few minutes rather than on every turn.
+"""
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from common.dates import local_date, user_zone
+
+CONTEXT_TTL = 60 * 5
+DUE_SOON = timedelta(hours=48)
+LIST_LIMIT = 5
+OPEN_STATUSES = ['todo', 'in_progress']
+
+
+def context_key(user_id):
+    return f'chatbot:context:{user_id}'
+
+
+def _when(dt, tz):
+    return dt.astimezone(tz).strftime('%a %b %d %H:%M')
+
+
+def build_snapshot(user):
+    """Render the snapshot for ``user``; four queries regardless of task count."""
+    from apps.analytics.models import DailyUserStats
+    from apps.tasks.models import Task
+
+    now = timezone.now()
+    tz = user_zone(user)
+    today = local_date(now, tz)
+    open_tasks = Task.objects.filter(user=user, status__in=OPEN_STATUSES).order_by()
+
+    counts = open_tasks.aggregate(
+        open=Count('id'),
+        overdue=Count('id', filter=Q(due_date__lt=now)),
+        due_soon=Count('id', filter=Q(due_date__gte=now, due_date__lt=now + DUE_SOON)),
+    )
+    due = open_tasks.filter(due_date__lt=now + DUE_SOON).order_by('due_date')[:LIST_LIMIT]
+    urgent = open_tasks.filter(priority__in=['P1', 'P2']).order_by('priority', 'sort_order')[:LIST_LIMIT]
+    focus = DailyUserStats.objects.filter(user=user, date__gte=today - timedelta(days=6)).aggregate(
+        today_seconds=Sum('focus_seconds', filter=Q(date=today)),
+        week_seconds=Sum('focus_seconds'),
+        week_sessions=Sum('focus_sessions'),
+        week_completed=Sum('tasks_completed'),
+    )
+    focus = {k: v or 0 for k, v in focus.items()}
+
+    lines = [
+        f"Today is {today:%A %B %d}.",
+        f"Open tasks: {counts['open']} ({counts['overdue']} overdue, {counts['due_soon']} due in the next 48h).",
+    ]
+    due_rows = due.values_list('title', 'priority', 'due_date')
+    if due_rows:
+        lines.append('Overdue or due soon:')
+        lines.extend(f"- {title} [{priority}] due {_when(due_date, tz)}" for title, priority, due_date in due_rows)
+    urgent_rows = urgent.values_list('title', 'priority', 'status')
+    if urgent_rows:
+        lines.append('High priority:')
+        lines.extend(
+            f"- {title} [{priority}]" + (' (in progress)' if state == 'in_progress' else '')
+            for title, priority, state in urgent_rows
+        )
+    lines.append(
+        f"Focus: {focus['today_seconds'] // 60} min today, {focus['week_seconds'] // 60} min over "
+        f"{focus['week_sessions']} sessions in the last 7 days; {focus['week_completed']} tasks completed."
+    )
+    return '\n'.join(lines)
+
+
+async def get_snapshot(user):
+    """Cached snapshot for ``user``."""
+    key = context_key(user.pk)
+    snapshot = await cache.aget(key)
+    if snapshot is None:
+        snapshot = await sync_to_async(build_snapshot)(user)
+        await cache.aset(key, snapshot, CONTEXT_TTL)
+    return snapshot
@@ -0,0 +1,99 @@
+"""
+Token-budgeted compaction of chat history.
+
+Only the most recent turns that fit ``RECENT_TOKEN_BUDGET`` are sent to the
+model verbatim. Older turns are folded into a rolling extractive summary that
+is stored on the ``Conversation``, so each request pays for the summary once
+instead of re-sending every earlier message in full.
+"""
+import json
+import logging
+import re
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+CHARS_PER_TOKEN = 4
+RECENT_TOKEN_BUDGET = 1_000
+SUMMARY_TOKEN_BUDGET = 400
+SUMMARY_LINE_CHARS = 160
+
+_sentence_end = re.compile(r'(?<=[.!?])\s')
+
+
+def estimate_tokens(text):
+    """Rough token count (~4 characters per token for English text)."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def split_recent(turns, budget=RECENT_TOKEN_BUDGET):
+    """
+    Split ``turns`` into (older, recent) where ``recent`` is the longest
+    suffix within ``budget`` tokens. The newest turn is always kept, cut to
+    the budget if it is too long on its own.
+    """
+    used = 0
+    start = len(turns)
+    for index in range(len(turns) - 1, -1, -1):
+        cost = estimate_tokens(turns[index]['content'])
+        if used + cost > budget:
+            break
+        used += cost
+        start = index
+    recent = turns[start:]
+    if not recent and turns:
+        newest = turns[-1]
+        recent = [{**newest, 'content': newest['content'][-budget * CHARS_PER_TOKEN:]}]
+        start = len(turns) - 1
+    return turns[:start], recent
+
+
+def summary_line(turn):
+    text = ' '.join(turn['content'].split())
+    first = _sentence_end.split(text, maxsplit=1)[0]
+    if len(first) > SUMMARY_LINE_CHARS:
+        first = first[:SUMMARY_LINE_CHARS - 1].rstrip() + '…'
+    speaker = 'User' if turn['role'] == 'user' else 'Assistant'
+    return f'{speaker}: {first}'
+
+
+def extend_summary(summary, turns):
+    """Append one line per turn, dropping the oldest lines past the budget."""
+    lines = summary.splitlines() if summary else []
+    lines.extend(summary_line(turn) for turn in turns if turn['content'].strip())
+    while lines and estimate_tokens('\n'.join(lines)) > SUMMARY_TOKEN_BUDGET:
+        lines.pop(0)
+    return '\n'.join(lines)
+
+
+@dataclass
+class Compacted:
+    summary: str
+    folded: int
+    recent: list
+    bytes_saved: int
+
+
+def compact(summary, turns):
+    """
+    Compact the not-yet-summarized ``turns`` of a conversation.
+
+    Turns that no longer fit the recent budget are appended to ``summary``;
+    ``folded`` is how many of them there were, so the caller can advance the
+    conversation's ``summarized_turns``. ``bytes_saved`` compares the payload
+    with re-sending the last 20 raw turns.
+    """
+    older, recent = split_recent(turns)
+    if older:
+        summary = extend_summary(summary, older)
+
+    naive = len(json.dumps(turns[-20:]).encode())
+    sent = len(json.dumps(recent).encode()) + len(summary.encode())
+    saved = naive - sent
+    logger.info(
+        'chat history compacted', extra={
+            'turns': len(turns), 'recent_turns': len(recent),
+            'bytes_sent': sent, 'bytes_saved': saved,
+        },
+    )
+    return Compacted(summary=summary, folded=len(older), recent=recent, bytes_saved=saved)
@@ -0,0 +1,45 @@
+from django.db import models
+from django.conf import settings
+from common.models import BaseModel
+
+
+class Conversation(BaseModel):
+    """A chat thread with the assistant, with a rolling summary of older turns."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='chat_conversations')
+    title = models.CharField(max_length=255, blank=True)
+    summary = models.TextField(blank=True)
+    summarized_turns = models.PositiveIntegerField(
+        default=0, help_text='Number of leading messages already folded into the summary',
+    )
+
+    class Meta:
+        db_table = 'chat_conversations'
+        ordering = ['-updated_at']
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
+
+    def __str__(self):
+        return self.title or str(self.id)
+
+
+class ChatMessage(BaseModel):
+    """One user or assistant turn in a conversation."""
+    ROLE_CHOICES = [
+        ('user', 'User'),
+        ('assistant', 'Assistant'),
+    ]
+
+    conversation = models.ForeignKey(Conversation, on_delete=models.CASCADE, related_name='messages')
+    role = models.CharField(max_length=10, choices=ROLE_CHOICES)
+    content = models.TextField()
+
+    class Meta:
+        db_table = 'chat_messages'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['conversation', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.role}: {self.content[:50]}"
@@ -0,0 +1,34 @@
+"""
+Content-addressed cache of assistant replies.
+
+Many chats open with the same canned question and no history, so replies are
+stored under a hash of the normalized conversation plus the model parameters
+and served from memory until they expire. The prompt includes the user's
+workload snapshot (see ``context.py``), so a reply is only reused while that
+snapshot is unchanged.
+"""
+import hashlib
+import json
+
+from common.cache import TTLCache
+
+from .client import MODEL_PARAMS
+
+REPLY_CACHE_SIZE = 2_000
+REPLY_CACHE_TTL = 60 * 60
+
+reply_cache = TTLCache(maxsize=REPLY_CACHE_SIZE, ttl=REPLY_CACHE_TTL)
+
+
+def normalize(text):
+    return ' '.join(str(text).split()).casefold()
+
+
+def reply_key(messages):
+    """Key for ``messages``: case and whitespace differences share an entry."""
+    payload = {
+        'params': MODEL_PARAMS,
+        'messages': [[m['role'], normalize(m['content'])] for m in messages],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+    return hashlib.sha256(encoded).hexdigest()
@@ -1,6 +1,10 @@
 from django.urls import path
-from .views import ChatView
+from rest_framework.routers import SimpleRouter
+from .views import ChatView, ConversationViewSet
+
+router = SimpleRouter()
+router.register('conversations', ConversationViewSet, basename='chat-conversations')
 
 urlpatterns = [
     path('', ChatView.as_view(), name='chatbot'),
-]
+] + router.urls
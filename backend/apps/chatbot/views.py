@@ -1,12 +1,33 @@
 """
 FlowState AI Chatbot — Groq-powered productivity assistant.
 Uses Groq's free API with Llama models (OpenAI-compatible).
+
+The view is async so a slow LLM call doesn't pin a worker thread, and can
+relay the reply token by token as Server-Sent Events. Conversations are
+stored server-side, so each request carries only the new message.
 """
+import json
+
 import httpx
+from asgiref.sync import sync_to_async
 from django.conf import settings
-from rest_framework.views import APIView
-from rest_framework.response import Response
-from rest_framework import status
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import mixins, status, viewsets
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAuthenticated
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from . import client
+from .context import get_snapshot
+from .history import compact
+from .models import ChatMessage, Conversation
+from .replies import reply_cache, reply_key
+from .serializers import ConversationDetailSerializer, ConversationSerializer
 
 
 SYSTEM_PROMPT = (
@@ -22,79 +43,219 @@ SYSTEM_PROMPT = (
     "If asked about something unrelated to productivity, gently redirect the conversation."
 )
 
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
+TIMEOUT_ERROR = 'The AI took too long to respond. Please try again.'
+
+
+def build_messages(user_message, context='', summary='', recent=()):
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+
+    # Snapshot of the user's tasks and focus (see context.py)
+    if context:
+        messages.append({"role": "system", "content": f"What the user is working on:\n{context}"})
+
+    # Older turns arrive pre-compacted (see history.py)
+    if summary:
+        messages.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+    messages.extend(recent)
+
+    # Add current message
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def open_conversation(user, conversation_id, user_message):
+    """
+    Load (or start) the conversation and compact its history. Returns
+    ``(conversation, compacted)``, or ``None`` when ``conversation_id``
+    doesn't name one of the user's conversations.
+
+    Nothing is written here: a new conversation stays unsaved and the user
+    message is stored together with the reply by ``record_reply``, so a
+    failed upstream call leaves no orphan conversation or unanswered turn.
+    """
+    if conversation_id:
+        try:
+            conversation = Conversation.objects.filter(user=user, pk=conversation_id).first()
+        except ValidationError:
+            conversation = None
+        if conversation is None:
+            return None
+        turns = list(
+            conversation.messages.values('role', 'content')[conversation.summarized_turns:]
+        )
+    else:
+        conversation = Conversation(user=user, title=user_message[:80])
+        turns = []
+
+    compacted = compact(conversation.summary, turns)
+    if compacted.folded:
+        conversation.summary = compacted.summary
+        conversation.summarized_turns += compacted.folded
+    return conversation, compacted
+
+
+@transaction.atomic
+def record_reply(conversation, user_message, reply):
+    """Save the conversation with the answered turn: the user message and the reply."""
+    if conversation._state.adding:
+        conversation.save()
+    else:
+        conversation.save(update_fields=['summary', 'summarized_turns', 'updated_at'])
+    ChatMessage.objects.create(conversation=conversation, role='user', content=user_message)
+    ChatMessage.objects.create(conversation=conversation, role='assistant', content=reply)
 
 
-class ChatView(APIView):
+def sse(data, event=None):
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class ChatView(View):
     """
     POST /api/chatbot/
-    Body: { "message": "user message", "history": [...] }
-    Returns: { "reply": "assistant response" }
+    Body: { "message": "user message", "conversation_id": "...", "stream": false }
+    Returns: { "reply": "assistant response", "conversation_id": "..." }
+
+    Omit ``conversation_id`` to start a new conversation.
+
+    With ``"stream": true`` (or ``Accept: text/event-stream``) the reply is
+    sent as Server-Sent Events: ``data: {"token": ...}`` per chunk, then
+    ``event: done`` with the full reply, or ``event: error``.
+
+    Replies are cached by conversation content (see ``replies.py``); the
+    ``X-Cache`` header says whether the upstream call was skipped.
+    Stored history is compacted to a token budget, and a cached snapshot of
+    the user's tasks and focus is added to the prompt.
     """
 
-    def post(self, request):
-        user_message = request.data.get('message', '').strip()
+    async def authenticate(self, request):
+        try:
+            result = await sync_to_async(JWTAuthentication().authenticate)(request)
+        except AuthenticationFailed:
+            return None
+        return result[0] if result else None
+
+    def tag(self, response, hit, compacted):
+        response['X-Cache'] = 'HIT' if hit else 'MISS'
+        response['X-History-Bytes-Saved'] = compacted.bytes_saved
+        return response
+
+    async def post(self, request):
+        user = await self.authenticate(request)
+        if user is None:
+            return JsonResponse(
+                {'detail': 'Authentication credentials were not provided.'},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        try:
+            data = json.loads(request.body or b'{}')
+        except ValueError:
+            return JsonResponse({'error': 'Invalid JSON body.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        user_message = str(data.get('message', '')).strip()
         if not user_message:
-            return Response(
+            return JsonResponse(
                 {'error': 'Message is required.'},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        api_key = getattr(settings, 'GROQ_API_KEY', '')
-        if not api_key:
-            return Response(
+        if not getattr(settings, 'GROQ_API_KEY', ''):
+            return JsonResponse(
                 {'error': 'AI service is not configured. Please set GROQ_API_KEY.'},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
-        try:
-            # Build messages array
-            messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-            # Add recent conversation history (cap at 20 messages to limit payload)
-            history = request.data.get('history', [])[-20:]
-            for msg in history:
-                role = 'user' if msg.get('role') == 'user' else 'assistant'
-                messages.append({"role": role, "content": msg.get('content', '')})
-
-            # Add current message
-            messages.append({"role": "user", "content": user_message})
-
-            # Call Groq API
-            response = httpx.post(
-                GROQ_API_URL,
-                headers={
-                    "Authorization": f"Bearer {api_key}",
-                    "Content-Type": "application/json",
-                },
-                json={
-                    "model": "llama-3.3-70b-versatile",
-                    "messages": messages,
-                    "temperature": 0.7,
-                    "max_tokens": 500,
-                },
-                timeout=30.0,
+        opened = await sync_to_async(open_conversation)(
+            user, str(data.get('conversation_id') or ''), user_message,
+        )
+        if opened is None:
+            return JsonResponse({'detail': 'Conversation not found.'}, status=status.HTTP_404_NOT_FOUND)
+        conversation, compacted = opened
+
+        # The snapshot is part of the prompt and therefore of the reply key, so
+        # cached replies are only reused while the user's workload is unchanged.
+        context = await get_snapshot(user)
+        messages = build_messages(user_message, context, compacted.summary, compacted.recent)
+        key = reply_key(messages)
+        cached = reply_cache.get(key)
+
+        wants_stream = data.get('stream') or 'text/event-stream' in request.headers.get('Accept', '')
+        if wants_stream:
+            response = StreamingHttpResponse(
+                self.stream_reply(conversation, user_message, messages, key, cached), content_type='text/event-stream',
             )
+            response['Cache-Control'] = 'no-cache'
+            response['X-Accel-Buffering'] = 'no'
+            return self.tag(response, cached is not None, compacted)
 
-            if response.status_code != 200:
-                error_data = response.json()
-                error_msg = error_data.get('error', {}).get('message', 'Unknown error')
-                return Response(
-                    {'error': f'AI error: {error_msg}'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                )
+        if cached is not None:
+            await sync_to_async(record_reply)(conversation, user_message, cached)
+            return self.tag(JsonResponse({'reply': cached, 'conversation_id': conversation.pk}), True, compacted)
 
-            data = response.json()
-            reply = data['choices'][0]['message']['content']
-            return Response({'reply': reply})
+        try:
+            reply = await client.complete(messages)
+            reply_cache.set(key, reply)
+            await sync_to_async(record_reply)(conversation, user_message, reply)
+            return self.tag(JsonResponse({'reply': reply, 'conversation_id': conversation.pk}), False, compacted)
 
+        except client.GroqError as e:
+            return JsonResponse(
+                {'error': f'AI error: {e}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
         except httpx.TimeoutException:
-            return Response(
-                {'error': 'The AI took too long to respond. Please try again.'},
+            return JsonResponse(
+                {'error': TIMEOUT_ERROR},
                 status=status.HTTP_504_GATEWAY_TIMEOUT,
             )
         except Exception as e:
-            return Response(
+            return JsonResponse(
                 {'error': f'Something went wrong: {str(e)[:200]}'},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+    async def stream_reply(self, conversation, user_message, messages, key, cached=None):
+        done = {'conversation_id': str(conversation.pk)}
+        if cached is not None:
+            await sync_to_async(record_reply)(conversation, user_message, cached)
+            yield sse({'token': cached})
+            yield sse({'reply': cached, **done}, event='done')
+            return
+
+        parts = []
+        try:
+            async for token in client.stream(messages):
+                parts.append(token)
+                yield sse({'token': token})
+        except client.GroqError as e:
+            yield sse({'error': f'AI error: {e}'}, event='error')
+            return
+        except httpx.TimeoutException:
+            yield sse({'error': TIMEOUT_ERROR}, event='error')
+            return
+        except Exception as e:
+            yield sse({'error': f'Something went wrong: {str(e)[:200]}'}, event='error')
+            return
+        reply = ''.join(parts)
+        reply_cache.set(key, reply)
+        await sync_to_async(record_reply)(conversation, user_message, reply)
+        yield sse({'reply': reply, **done}, event='done')
+
+
+class ConversationViewSet(mixins.ListModelMixin, mixins.RetrieveModelMixin,
+                          mixins.DestroyModelMixin, viewsets.GenericViewSet):
+    """List, read back and delete the user's chatbot conversations."""
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        queryset = Conversation.objects.filter(user=self.request.user)
+        if self.action == 'retrieve':
+            queryset = queryset.prefetch_related('messages')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return ConversationDetailSerializer
+        return ConversationSerializer
@@ -0,0 +1,72 @@
+"""
+Focus statistics from one pass over the ``DailyUserStats`` rollup.
+
+``FocusDays.load`` fetches every day with focus activity for a user in a
+single query. Totals are summed from those rows. Streaks come from a bitmap
+with one bit per calendar day, so the current and longest runs are a few
+integer operations rather than a walk over dates. The heatmap is sliced
+from the same rows.
+"""
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from apps.analytics.models import DailyUserStats
+
+HEATMAP_DAYS = 365
+
+
+@dataclass
+class FocusDays:
+    # date -> (sessions, seconds), only for days with at least one session
+    days: dict = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, user):
+        rows = (
+            DailyUserStats.objects.filter(user=user, focus_sessions__gt=0)
+            .order_by()
+            .values_list('date', 'focus_sessions', 'focus_seconds')
+        )
+        return cls({day: (sessions, seconds) for day, sessions, seconds in rows})
+
+    def totals(self, since=None):
+        sessions = seconds = 0
+        for day, (day_sessions, day_seconds) in self.days.items():
+            if since is None or day >= since:
+                sessions += day_sessions
+                seconds += day_seconds
+        return sessions, seconds
+
+    def bitmap(self, today):
+        """Bit ``n`` is set when there was focus ``n`` days before ``today``."""
+        bits = 0
+        for day in self.days:
+            offset = (today - day).days
+            if offset >= 0:
+                bits |= 1 << offset
+        return bits
+
+    @staticmethod
+    def current_streak(bits):
+        """Consecutive days ending today: the run of trailing one bits."""
+        return (~bits & (bits + 1)).bit_length() - 1
+
+    @staticmethod
+    def longest_streak(bits):
+        """Each ``bits & (bits >> 1)`` shortens every run of ones by one."""
+        longest = 0
+        while bits:
+            bits &= bits >> 1
+            longest += 1
+        return longest
+
+    def heatmap(self, today, length=HEATMAP_DAYS):
+        """Sessions and focus minutes per day for ``length`` days ending today."""
+        start = today - timedelta(days=length - 1)
+        sessions, minutes = [0] * length, [0] * length
+        for day, (day_sessions, day_seconds) in self.days.items():
+            index = (day - start).days
+            if 0 <= index < length:
+                sessions[index] = day_sessions
+                minutes[index] = day_seconds // 60
+        return {'start': start, 'end': today, 'sessions': sessions, 'minutes': minutes}
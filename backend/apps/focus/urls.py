@@ -1,10 +1,11 @@
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import FocusSessionViewSet, FocusStatsView
+from .views import FocusHeatmapView, FocusSessionViewSet, FocusStatsView
 
 router = DefaultRouter()
 router.register('sessions', FocusSessionViewSet, basename='focus-sessions')
 
 urlpatterns = router.urls + [
     path('stats/', FocusStatsView.as_view(), name='focus-stats'),
+    path('heatmap/', FocusHeatmapView.as_view(), name='focus-heatmap'),
 ]
@@ -3,18 +3,22 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
-from django.utils import timezone
-from django.db.models import Sum, Count, Q
 from datetime import timedelta
 
+from common.cache import cache_user_response
+from common.dates import user_today
+from common.pagination import KeysetPagination
 from common.permissions import IsOwner
 from .models import FocusSession
 from .serializers import FocusSessionSerializer
+from .stats import FocusDays
 
 
 class FocusSessionViewSet(viewsets.ModelViewSet):
     """CRUD for focus sessions."""
     serializer_class = FocusSessionSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-started_at',)
     permission_classes = [IsAuthenticated, IsOwner]
 
     def get_queryset(self):
@@ -28,41 +32,39 @@ class FocusStatsView(APIView):
     """Focus session statistics and streak info."""
     permission_classes = [IsAuthenticated]
 
+    @cache_user_response()
     def get(self, request):
-        now = timezone.now()
-        today = now.date()
+        today = user_today(request.user)
         week_ago = today - timedelta(days=7)
 
-        sessions = FocusSession.objects.filter(user=request.user, is_completed=True)
-
-        today_sessions = sessions.filter(started_at__date=today)
-        week_sessions = sessions.filter(started_at__date__gte=week_ago)
-        total_sessions = sessions
-
-        # Calculate streaks
-        dates = list(
-            sessions.values_list('started_at__date', flat=True)
-            .distinct().order_by('-started_at__date')
-        )
-        current_streak = 0
-        for i, d in enumerate(dates):
-            if d == today - timedelta(days=i):
-                current_streak += 1
-            else:
-                break
+        focus = FocusDays.load(request.user)
+        today_sessions, today_seconds = focus.totals(since=today)
+        week_sessions, week_seconds = focus.totals(since=week_ago)
+        total_sessions, total_seconds = focus.totals()
+        bits = focus.bitmap(today)
 
         return Response({
             'today': {
-                'sessions': today_sessions.count(),
-                'total_minutes': (today_sessions.aggregate(s=Sum('duration_seconds'))['s'] or 0) // 60,
+                'sessions': today_sessions,
+                'total_minutes': today_seconds // 60,
             },
             'this_week': {
-                'sessions': week_sessions.count(),
-                'total_minutes': (week_sessions.aggregate(s=Sum('duration_seconds'))['s'] or 0) // 60,
+                'sessions': week_sessions,
+                'total_minutes': week_seconds // 60,
             },
             'all_time': {
-                'sessions': total_sessions.count(),
-                'total_minutes': (total_sessions.aggregate(s=Sum('duration_seconds'))['s'] or 0) // 60,
+                'sessions': total_sessions,
+                'total_minutes': total_seconds // 60,
             },
-            'current_streak_days': current_streak,
+            'current_streak_days': focus.current_streak(bits),
+            'longest_streak_days': focus.longest_streak(bits),
         })
+
+
+class FocusHeatmapView(APIView):
+    """Contribution-style heatmap of the last 365 days of focus."""
+    permission_classes = [IsAuthenticated]
+
+    @cache_user_response()
+    def get(self, request):
+        return Response(FocusDays.load(request.user).heatmap(user_today(request.user)))
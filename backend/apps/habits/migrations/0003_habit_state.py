@@ -0,0 +1,63 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:09
+
+import django.db.models.deletion
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_states(apps, schema_editor):
+    """Replay each habit's completed days to build its streak state."""
+    HabitStreak = apps.get_model('habits', 'HabitStreak')
+    HabitState = apps.get_model('habits', 'HabitState')
+    rows = (
+        HabitStreak.objects.filter(completed_today=True)
+        .order_by('task_id', 'streak_date')
+        .values_list('user_id', 'task_id', 'streak_date', 'longest_streak')
+        .iterator()
+    )
+    states, state = [], None
+    for user_id, task_id, day, recorded_longest in rows:
+        if state is None or state.task_id != task_id:
+            state = HabitState(user_id=user_id, task_id=task_id)
+            states.append(state)
+        if state.last_completed == day - timedelta(days=1):
+            state.current_streak += 1
+        else:
+            state.current_streak = 1
+            state.run_start = day
+        state.longest_streak = max(state.longest_streak, state.current_streak, recorded_longest)
+        state.last_completed = day
+    HabitState.objects.bulk_create(states, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('habits', '0002_initial'),
+        ('tasks', '0004_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HabitState',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('run_start', models.DateField(blank=True, null=True)),
+                ('current_streak', models.IntegerField(default=0)),
+                ('longest_streak', models.IntegerField(default=0)),
+                ('last_completed', models.DateField(blank=True, null=True)),
+                ('task', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='habit_state', to='tasks.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='habit_states', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'habit_states',
+            },
+        ),
+        migrations.RunPython(backfill_states, migrations.RunPython.noop),
+    ]
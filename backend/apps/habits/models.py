@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django.db import models
 from django.conf import settings
 from common.models import BaseModel
@@ -24,6 +26,45 @@ class HabitStreak(BaseModel):
         return f"{self.task.title} - {self.streak_date}"
 
 
+class HabitState(BaseModel):
+    """
+    Running streak state per habit, updated in place on every check-in.
+    ``HabitStreak`` rows are the per-day log; nothing reads them to compute
+    the streak.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='habit_states')
+    task = models.OneToOneField('tasks.Task', on_delete=models.CASCADE, related_name='habit_state')
+    run_start = models.DateField(null=True, blank=True)
+    current_streak = models.IntegerField(default=0)
+    longest_streak = models.IntegerField(default=0)
+    last_completed = models.DateField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'habit_states'
+
+    def __str__(self):
+        return f"{self.task_id} - {self.current_streak}"
+
+    def complete(self, day):
+        """Record a completion on ``day``; returns False if it was already counted."""
+        if self.last_completed is not None and day <= self.last_completed:
+            return False
+        if self.last_completed == day - timedelta(days=1):
+            self.current_streak += 1
+        else:
+            self.current_streak = 1
+            self.run_start = day
+        self.longest_streak = max(self.longest_streak, self.current_streak)
+        self.last_completed = day
+        return True
+
+    def streak_on(self, day):
+        """Current streak as seen on ``day``: a run is broken once a day is missed."""
+        if self.last_completed is None or self.last_completed < day - timedelta(days=1):
+            return 0
+        return self.current_streak
+
+
 class DailyCheckin(BaseModel):
     """Daily reflection and energy tracking."""
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='daily_checkins')
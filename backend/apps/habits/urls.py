@@ -5,9 +5,10 @@ from .views import HabitListView, HabitCheckinView, HabitStreakView, HabitProgre
 router = DefaultRouter()
 router.register('checkins', DailyCheckinViewSet, basename='daily-checkins')
 
-urlpatterns = router.urls + [
+# Explicit routes come first so the router's API root doesn't shadow the habit list.
+urlpatterns = [
     path('', HabitListView.as_view(), name='habit-list'),
     path('<uuid:task_id>/checkin/', HabitCheckinView.as_view(), name='habit-checkin'),
     path('<uuid:task_id>/streaks/', HabitStreakView.as_view(), name='habit-streaks'),
     path('progress/', HabitProgressView.as_view(), name='habit-progress'),
-]
+] + router.urls
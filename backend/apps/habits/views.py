@@ -3,13 +3,17 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
+from django.db import transaction
+from django.db.models import Count, Q
 from django.shortcuts import get_object_or_404
-from django.utils import timezone
 from datetime import timedelta
 
+from common.cache import cache_user_response
+from common.dates import user_today
+from common.pagination import KeysetPagination
 from apps.tasks.models import Task
 from apps.tasks.serializers import TaskListSerializer
-from .models import HabitStreak, DailyCheckin
+from .models import HabitState, HabitStreak, DailyCheckin
 from .serializers import HabitStreakSerializer, DailyCheckinSerializer
 
 
@@ -18,7 +22,7 @@ class HabitListView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        habits = Task.objects.filter(user=request.user, is_recurring=True)
+        habits = Task.objects.filter(user=request.user, is_recurring=True).with_subtask_counts()
         serializer = TaskListSerializer(habits, many=True)
         return Response(serializer.data)
 
@@ -28,31 +32,29 @@ class HabitCheckinView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request, task_id):
-        today = timezone.now().date()
+        today = user_today(request.user)
         task = get_object_or_404(Task, id=task_id, user=request.user, is_recurring=True)
 
-        streak, created = HabitStreak.objects.get_or_create(
-            user=request.user, task=task, streak_date=today,
-            defaults={'completed_today': True, 'current_streak': 1, 'longest_streak': 1}
-        )
-
-        if not created and not streak.completed_today:
-            streak.completed_today = True
-
-            # Check yesterday
-            yesterday = HabitStreak.objects.filter(
-                user=request.user, task=task,
-                streak_date=today - timedelta(days=1),
-                completed_today=True
-            ).first()
-
-            if yesterday:
-                streak.current_streak = yesterday.current_streak + 1
-            else:
-                streak.current_streak = 1
-
-            streak.longest_streak = max(streak.longest_streak, streak.current_streak)
-            streak.save()
+        with transaction.atomic():
+            # The state row is locked, so concurrent check-ins for the same
+            # habit serialize on it instead of racing on the day log.
+            state, _ = HabitState.objects.select_for_update().get_or_create(user=request.user, task=task)
+            if state.complete(today):
+                state.save()
+
+            streak, created = HabitStreak.objects.get_or_create(
+                user=request.user, task=task, streak_date=today,
+                defaults={
+                    'completed_today': True,
+                    'current_streak': state.current_streak,
+                    'longest_streak': state.longest_streak,
+                },
+            )
+            if not created and not streak.completed_today:
+                streak.completed_today = True
+                streak.current_streak = state.current_streak
+                streak.longest_streak = state.longest_streak
+                streak.save()
 
         return Response(HabitStreakSerializer(streak).data)
 
@@ -64,7 +66,7 @@ class HabitStreakView(APIView):
     def get(self, request, task_id):
         streaks = HabitStreak.objects.filter(
             user=request.user, task_id=task_id
-        ).order_by('-streak_date')[:30]
+        ).select_related('task').order_by('-streak_date')[:30]
         return Response(HabitStreakSerializer(streaks, many=True).data)
 
 
@@ -72,27 +74,33 @@ class HabitProgressView(APIView):
     """Overall habit progress data."""
     permission_classes = [IsAuthenticated]
 
+    @cache_user_response()
     def get(self, request):
-        today = timezone.now().date()
+        today = user_today(request.user)
         last_30_days = today - timedelta(days=30)
 
-        habits = Task.objects.filter(user=request.user, is_recurring=True)
-        progress = []
+        # One query: completed days are counted over the day log's index and
+        # the streaks are read from the habit's state row.
+        habits = (
+            Task.objects.filter(user=request.user, is_recurring=True)
+            .annotate(completed_days=Count('habit_streaks', filter=Q(
+                habit_streaks__streak_date__gte=last_30_days, habit_streaks__completed_today=True,
+            )))
+            .select_related('habit_state')
+            .order_by('sort_order', '-created_at')
+        )
 
+        progress = []
         for habit in habits:
-            streaks = HabitStreak.objects.filter(
-                user=request.user, task=habit, streak_date__gte=last_30_days
-            )
-            completed = streaks.filter(completed_today=True).count()
-            latest = streaks.order_by('-streak_date').first()
+            state = getattr(habit, 'habit_state', None)
             progress.append({
                 'task_id': str(habit.id),
                 'title': habit.title,
-                'completed_days': completed,
+                'completed_days': habit.completed_days,
                 'total_days': 30,
-                'completion_rate': round(completed / 30 * 100, 1),
-                'current_streak': latest.current_streak if latest else 0,
-                'longest_streak': latest.longest_streak if latest else 0,
+                'completion_rate': round(habit.completed_days / 30 * 100, 1),
+                'current_streak': state.streak_on(today) if state else 0,
+                'longest_streak': state.longest_streak if state else 0,
             })
 
         return Response(progress)
@@ -101,6 +109,8 @@ class HabitProgressView(APIView):
 class DailyCheckinViewSet(viewsets.ModelViewSet):
     """Daily check-in management."""
     serializer_class = DailyCheckinSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-checkin_date',)
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
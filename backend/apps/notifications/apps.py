@@ -4,3 +4,6 @@ class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.notifications'
     label = 'notifications'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -23,5 +23,5 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         pass
 
     async def notification_message(self, event):
-        """Send notification to WebSocket."""
+        """Send a batch of new notifications (see ``push.publish``) to the WebSocket."""
         await self.send(text_data=json.dumps(event['data']))
@@ -1,27 +1,60 @@
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
 from django.contrib.auth.models import AnonymousUser
 from channels.db import database_sync_to_async
 from channels.middleware import BaseMiddleware
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from django.contrib.auth import get_user_model
 
+from common.cache import TTLCache, bump_user_version, get_user_version
+
 User = get_user_model()
 
+# user id -> (version, User), so reconnect storms verify the JWT signature
+# in-process and only hit the users table once per user per TTL. Entries are
+# tagged with the user's version from the shared cache (see common/cache.py),
+# under a namespace of their own so task and focus writes don't touch it.
+# Bumping it when the user changes or a token is blacklisted (signals.py)
+# invalidates the entry in every process, not just the one that saw the write.
+user_cache = TTLCache(maxsize=10_000, ttl=300)
+VERSION_NAMESPACE = 'ws-user-version'
+
+
 @database_sync_to_async
-def get_user(token_key):
+def _load_user(user_id):
+    return User.objects.filter(id=user_id, is_active=True).first()
+
+
+def forget_user(user_id):
+    bump_user_version(user_id, VERSION_NAMESPACE)
+
+
+async def get_user(token_key):
     try:
-        decoded_token = AccessToken(token_key)
-        user_id = decoded_token['user_id']
-        return User.objects.get(id=user_id)
-    except (InvalidToken, TokenError, User.DoesNotExist):
+        user_id = str(AccessToken(token_key)[api_settings.USER_ID_CLAIM])
+    except (InvalidToken, TokenError, KeyError):
         return AnonymousUser()
 
+    version = await sync_to_async(get_user_version)(user_id, VERSION_NAMESPACE)
+    entry = user_cache.get(user_id)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    user = await _load_user(user_id)
+    if user is None:
+        user_cache.pop(user_id)
+        return AnonymousUser()
+    user_cache.set(user_id, (version, user))
+    return user
+
+
 class JwtAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         # Look for token in query string
-        query_string = scope.get('query_string', b'').decode()
-        query_params = dict(qs.split('=') for qs in query_string.split('&') if '=' in qs)
-        token = query_params.get('token')
+        query_params = parse_qs(scope.get('query_string', b'').decode())
+        token = query_params.get('token', [None])[0]
 
         if token:
             scope['user'] = await get_user(token)
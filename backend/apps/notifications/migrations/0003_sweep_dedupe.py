@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:45
+
+import django.db.models.fields.json
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_alerts(apps, schema_editor):
+    """Keep the oldest overdue/reminder notification per (user, type, task)."""
+    Notification = apps.get_model('notifications', 'Notification')
+    seen = set()
+    duplicates = []
+    alerts = (
+        Notification.objects.filter(type__in=['overdue', 'reminder'])
+        .order_by('created_at')
+        .values_list('id', 'user_id', 'type', 'metadata')
+    )
+    for pk, user_id, type_, metadata in alerts.iterator(chunk_size=2000):
+        task_id = (metadata or {}).get('task_id')
+        if task_id is None:
+            continue
+        key = (user_id, type_, str(task_id))
+        if key in seen:
+            duplicates.append(pk)
+        else:
+            seen.add(key)
+    for start in range(0, len(duplicates), 1000):
+        Notification.objects.filter(pk__in=duplicates[start:start + 1000]).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SweepWatermark',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'notification_sweep_watermarks',
+            },
+        ),
+        migrations.RunPython(remove_duplicate_alerts, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='notification',
+            constraint=models.UniqueConstraint(models.F('user'), models.F('type'), django.db.models.fields.json.KeyTextTransform('task_id', 'metadata'), condition=models.Q(('type__in', ['overdue', 'reminder'])), name='notifications_one_alert_per_task'),
+        ),
+    ]
@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import F, Q
+from django.db.models.fields.json import KeyTextTransform
 from django.conf import settings
 from common.models import BaseModel
 
@@ -24,7 +26,28 @@ class Notification(BaseModel):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['user', 'is_read', 'created_at']),
+            models.Index(fields=['user', '-created_at']),
+        ]
+        constraints = [
+            # One overdue/reminder alert per task; backs the sweep's dedupe.
+            models.UniqueConstraint(
+                F('user'), F('type'), KeyTextTransform('task_id', 'metadata'),
+                condition=Q(type__in=['overdue', 'reminder']),
+                name='notifications_one_alert_per_task',
+            ),
         ]
 
     def __str__(self):
         return f"{self.type}: {self.title}"
+
+
+class SweepWatermark(BaseModel):
+    """Upper bound of the due-date window a notification sweep has already covered."""
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'notification_sweep_watermarks'
+
+    def __str__(self):
+        return f"{self.name}: {self.watermark}"
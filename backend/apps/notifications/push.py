@@ -0,0 +1,49 @@
+"""Publish new notifications to the user's WebSocket channel group."""
+import logging
+from collections import defaultdict
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+# Items included per message; the full count is always sent so the client
+# can fall back to refetching the list when a sweep produced more.
+PUSH_BATCH_LIMIT = 20
+
+
+def group_name(user_id):
+    return f'notifications_{user_id}'
+
+
+def publish(notifications):
+    """
+    Push ``notifications`` to their owners, one channel-layer message per user.
+
+    Delivery is best effort: a channel layer outage must never fail the
+    request or sweep that created the notifications.
+    """
+    layer = get_channel_layer()
+    if layer is None:
+        return
+
+    by_user = defaultdict(list)
+    for notification in notifications:
+        by_user[notification.user_id].append(notification)
+
+    for user_id, items in by_user.items():
+        message = items[0].title if len(items) == 1 else f'You have {len(items)} new notifications'
+        data = {
+            'message': message,
+            'count': len(items),
+            'notifications': NotificationSerializer(items[:PUSH_BATCH_LIMIT], many=True).data,
+        }
+        try:
+            async_to_sync(layer.group_send)(group_name(user_id), {
+                'type': 'notification.message',
+                'data': data,
+            })
+        except Exception:
+            logger.warning('Failed to push notifications to user %s', user_id, exc_info=True)
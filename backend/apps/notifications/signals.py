@@ -0,0 +1,30 @@
+"""Notification push hooks and WebSocket auth cache invalidation."""
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from .middleware import forget_user
+from .models import Notification
+from .push import publish
+
+
+@receiver(post_save, sender=Notification)
+def push_created_notification(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: publish([instance]))
+
+
+@receiver(post_save, sender=get_user_model())
+@receiver(post_delete, sender=get_user_model())
+def forget_changed_user(sender, instance, **kwargs):
+    # After commit, so another process can't reload the old row under the new version.
+    transaction.on_commit(lambda: forget_user(instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def forget_logged_out_user(sender, instance, created, **kwargs):
+    if created and instance.token.user_id:
+        user_id = instance.token.user_id
+        transaction.on_commit(lambda: forget_user(user_id))
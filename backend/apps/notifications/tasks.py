@@ -1,56 +1,156 @@
 """Celery tasks for notifications (email reminders, overdue alerts)."""
-from celery import shared_task
+from itertools import islice
+from uuid import UUID
+
+from celery import chord, shared_task
+from django.conf import settings
 from django.utils import timezone
 from django.core.mail import send_mail
-from datetime import timedelta
+from django.db.models import Q
+from datetime import datetime, timedelta
 
+OPEN_STATUSES = ['todo', 'in_progress']
+REMINDER_LEAD = timedelta(hours=24)
+SWEEP_CHUNK_SIZE = 1000
+UUID_SPACE = 1 << 128
 
-@shared_task
-def send_overdue_alerts():
-    """Check for overdue tasks and create notifications."""
+
+def _sweep_candidates(kind, now, since):
+    """
+    Open tasks that may need a ``kind`` alert.
+
+    After the first run only tasks whose due date crossed the alert threshold
+    since the previous watermark are considered, plus tasks edited since then
+    (a due date moved into the window, a task reopened).
+    """
     from apps.tasks.models import Task
+
+    tasks = Task.objects.filter(status__in=OPEN_STATUSES)
+    if kind == 'overdue':
+        tasks = tasks.filter(due_date__lt=now)
+        crossed = Q(due_date__gte=since)
+    else:
+        tasks = tasks.filter(due_date__range=[now, now + REMINDER_LEAD])
+        crossed = Q(due_date__gt=since + REMINDER_LEAD) if since else Q()
+    if since is not None:
+        tasks = tasks.filter(crossed | Q(updated_at__gte=since))
+    return tasks.values_list('id', 'user_id', 'title', 'due_date').order_by()
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def _build_alert(kind, task_id, user_id, title, due_date):
     from apps.notifications.models import Notification
 
-    now = timezone.now()
-    overdue_tasks = Task.objects.filter(
-        status__in=['todo', 'in_progress'],
-        due_date__lt=now,
-    ).select_related('user')
+    if kind == 'overdue':
+        heading, message = f'Overdue: {title}', f'Your task "{title}" was due {due_date}.'
+    else:
+        heading, message = f'Due soon: {title}', f'Your task "{title}" is due {due_date}.'
+    return Notification(
+        user_id=user_id, type=kind, title=heading, message=message,
+        metadata={'task_id': str(task_id)},
+    )
+
+
+def create_alerts(kind, rows):
+    """
+    Insert ``kind`` alerts for ``rows`` of (task id, user id, title, due date).
 
-    for task in overdue_tasks:
-        Notification.objects.get_or_create(
-            user=task.user,
-            type='overdue',
-            title=f'Overdue: {task.title}',
-            defaults={
-                'message': f'Your task "{task.title}" was due {task.due_date}.',
-                'metadata': {'task_id': str(task.id)},
-            }
-        )
+    Tasks that already have an alert are anti-joined out with one lookup on
+    ``metadata->task_id``; the unique constraint plus ``ignore_conflicts``
+    covers races with a concurrent sweep. Rows dropped by a conflict are
+    filtered out by re-selecting the new ids, so only the alerts actually
+    inserted are pushed to connected clients, in one message per user.
+    Returns the notifications created.
+    """
+    from apps.notifications.models import Notification
+    from apps.notifications.push import publish
+
+    task_ids = [str(row[0]) for row in rows]
+    existing = set(
+        Notification.objects.filter(type=kind, metadata__task_id__in=task_ids)
+        .values_list('metadata__task_id', flat=True)
+    )
+    alerts = [_build_alert(kind, *row) for row in rows if str(row[0]) not in existing]
+    if not alerts:
+        return alerts
+    Notification.objects.bulk_create(alerts, ignore_conflicts=True)
+    inserted = set(
+        Notification.objects.filter(pk__in=[alert.pk for alert in alerts]).values_list('pk', flat=True)
+    )
+    alerts = [alert for alert in alerts if alert.pk in inserted]
+    publish(alerts)
+    return alerts
+
+
+def shard_bounds(shard, shards):
+    """
+    User-id range owned by ``shard`` of ``shards``.
+
+    User ids are random UUIDs, so equal slices of the UUID space are a hash
+    partition of users that the primary-key index can range-scan.
+    """
+    lower = UUID(int=(UUID_SPACE * shard) // shards)
+    upper = UUID(int=(UUID_SPACE * (shard + 1)) // shards) if shard + 1 < shards else None
+    return lower, upper
+
+
+@shared_task
+def sweep_shard(kind, shard, shards, now, since=None):
+    """Create ``kind`` alerts for the users in one shard; returns the number created."""
+    now = datetime.fromisoformat(now)
+    since = datetime.fromisoformat(since) if since else None
+    lower, upper = shard_bounds(shard, shards)
+
+    candidates = _sweep_candidates(kind, now, since).filter(user_id__gte=lower)
+    if upper is not None:
+        candidates = candidates.filter(user_id__lt=upper)
+
+    created = 0
+    for chunk in _chunks(candidates.iterator(chunk_size=SWEEP_CHUNK_SIZE), SWEEP_CHUNK_SIZE):
+        created += len(create_alerts(kind, chunk))
+    return created
+
+
+@shared_task
+def finish_sweep(results, kind, now):
+    """Chord callback: advance the watermark once every shard has succeeded."""
+    from apps.notifications.models import SweepWatermark
+
+    SweepWatermark.objects.filter(name=kind).update(
+        watermark=datetime.fromisoformat(now), updated_at=timezone.now(),
+    )
+    return sum(results)
+
+
+def dispatch_sweep(kind):
+    """Fan a ``kind`` sweep out over ``NOTIFICATION_SWEEP_SHARDS`` shard workers."""
+    from apps.notifications.models import SweepWatermark
+
+    shards = settings.NOTIFICATION_SWEEP_SHARDS
+    now = timezone.now().isoformat()
+    mark, _ = SweepWatermark.objects.get_or_create(name=kind)
+    since = mark.watermark.isoformat() if mark.watermark else None
+
+    return chord(
+        sweep_shard.s(kind, shard, shards, now, since) for shard in range(shards)
+    )(finish_sweep.s(kind, now))
+
+
+@shared_task
+def send_overdue_alerts():
+    """Check for overdue tasks and create notifications."""
+    return dispatch_sweep('overdue').id
 
 
 @shared_task
 def send_upcoming_reminders():
     """Send reminders for tasks due in the next 24 hours."""
-    from apps.tasks.models import Task
-    from apps.notifications.models import Notification
-
-    now = timezone.now()
-    upcoming = Task.objects.filter(
-        status__in=['todo', 'in_progress'],
-        due_date__range=[now, now + timedelta(hours=24)],
-    ).select_related('user')
-
-    for task in upcoming:
-        Notification.objects.get_or_create(
-            user=task.user,
-            type='reminder',
-            title=f'Due soon: {task.title}',
-            defaults={
-                'message': f'Your task "{task.title}" is due {task.due_date}.',
-                'metadata': {'task_id': str(task.id)},
-            }
-        )
+    return dispatch_sweep('reminder').id
 
 
 @shared_task
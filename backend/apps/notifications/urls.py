@@ -5,6 +5,7 @@ from .views import NotificationViewSet, MarkAllReadView
 router = DefaultRouter()
 router.register('', NotificationViewSet, basename='notifications')
 
-urlpatterns = router.urls + [
+# Explicit routes come first so the router's detail pattern doesn't swallow them.
+urlpatterns = [
     path('read-all/', MarkAllReadView.as_view(), name='mark-all-read'),
-]
+] + router.urls
@@ -3,14 +3,19 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
+from django.utils import timezone
 
+from common.conditional import ConditionalListMixin
+from common.pagination import KeysetPagination
 from .models import Notification
 from .serializers import NotificationSerializer
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ConditionalListMixin, viewsets.ModelViewSet):
     """CRUD for notifications."""
     serializer_class = NotificationSerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ('-created_at',)
     permission_classes = [IsAuthenticated]
     http_method_names = ['get', 'patch', 'delete', 'head', 'options']
 
@@ -30,5 +35,7 @@ class MarkAllReadView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        Notification.objects.filter(user=request.user, is_read=False).update(
+            is_read=True, updated_at=timezone.now(),
+        )
         return Response({'detail': 'All notifications marked as read.'})
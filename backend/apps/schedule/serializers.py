@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from common.ordering import ReorderItemSerializer
 from .models import TimeBlock
 
 
@@ -13,3 +14,8 @@ class TimeBlockSerializer(serializers.ModelSerializer):
             'sort_order', 'created_at',
         ]
         read_only_fields = ['id', 'created_at']
+
+
+class TimeBlockReorderItemSerializer(ReorderItemSerializer):
+    start_time = serializers.TimeField(required=False, allow_null=True)
+    end_time = serializers.TimeField(required=False, allow_null=True)
@@ -7,9 +7,12 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django.utils import timezone
 from datetime import timedelta
 
+from common.conditional import conditional, queryset_etag
+from common.dates import user_today
+from common.ordering import MAX_REORDER_ITEMS, bulk_reorder
 from common.permissions import IsOwner
 from .models import TimeBlock
-from .serializers import TimeBlockSerializer
+from .serializers import TimeBlockSerializer, TimeBlockReorderItemSerializer
 from apps.tasks.models import Task
 from apps.tasks.serializers import TaskListSerializer
 
@@ -29,15 +32,16 @@ class TimeBlockViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['patch'])
     def reorder(self, request):
-        """Drag-and-drop reorder."""
-        items = request.data.get('items', [])
-        for item in items:
-            updates = {'sort_order': item['sort_order']}
-            if item.get('start_time') is not None:
-                updates['start_time'] = item['start_time']
-            if item.get('end_time') is not None:
-                updates['end_time'] = item['end_time']
-            TimeBlock.objects.filter(id=item['id'], user=request.user).update(**updates)
+        """Drag-and-drop reorder, written in one statement."""
+        serializer = TimeBlockReorderItemSerializer(
+            data=request.data.get('items', []), many=True, max_length=MAX_REORDER_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        bulk_reorder(
+            TimeBlock.objects.filter(user=request.user),
+            serializer.validated_data,
+            fields=('sort_order', 'start_time', 'end_time'),
+        )
         return Response({'detail': 'Reordered.'})
 
 
@@ -46,12 +50,13 @@ class WeeklyScheduleView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        date_str = request.query_params.get('date', str(timezone.now().date()))
+        today = user_today(request.user)
+        date_str = request.query_params.get('date', str(today))
         from datetime import date as date_type
         try:
             current_date = date_type.fromisoformat(date_str)
         except ValueError:
-            current_date = timezone.now().date()
+            current_date = today
 
         start_of_week = current_date - timedelta(days=current_date.weekday())
         end_of_week = start_of_week + timedelta(days=6)
@@ -61,12 +66,13 @@ class WeeklyScheduleView(APIView):
             block_date__range=[start_of_week, end_of_week]
         ).select_related('task').order_by('block_date', 'start_time')
 
-        serializer = TimeBlockSerializer(blocks, many=True)
-        return Response({
+        # Blocks show their task's title, so task edits change the ETag too
+        etag = queryset_etag(blocks, ('task',), request.user.pk, start_of_week)
+        return conditional(request, etag, lambda: Response({
             'week_start': start_of_week,
             'week_end': end_of_week,
-            'blocks': serializer.data,
-        })
+            'blocks': TimeBlockSerializer(blocks, many=True).data,
+        }))
 
 
 class RiskDetectionView(APIView):
@@ -79,12 +85,12 @@ class RiskDetectionView(APIView):
             user=request.user,
             status__in=['todo', 'in_progress'],
             due_date__lt=now
-        )
+        ).with_subtask_counts()
         at_risk = Task.objects.filter(
             user=request.user,
             status__in=['todo', 'in_progress'],
             due_date__range=[now, now + timedelta(days=2)]
-        )
+        ).with_subtask_counts()
         return Response({
             'overdue': TaskListSerializer(overdue, many=True).data,
             'at_risk': TaskListSerializer(at_risk, many=True).data,
@@ -0,0 +1,19 @@
+from django.db import models
+from django.conf import settings
+from common.models import BaseModel
+
+
+class Tombstone(BaseModel):
+    """Record of a deleted row, so delta sync can tell clients to drop it."""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='tombstones')
+    kind = models.CharField(max_length=30, help_text='Sync collection name, e.g. tasks')
+    object_id = models.UUIDField()
+
+    class Meta:
+        db_table = 'sync_tombstones'
+        indexes = [
+            models.Index(fields=['user', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,46 @@
+"""
+Collections included in delta sync.
+
+Each entry names the collection in the sync payload, the model, and the
+lookup from the model to its owner. Rows are sent as plain field values
+(foreign keys as ids), which keeps the payload compact and independent of
+the per-endpoint serializers.
+"""
+from dataclasses import dataclass
+
+from django.apps import apps
+
+
+@dataclass(frozen=True)
+class Collection:
+    name: str
+    model_label: str
+    user_lookup: str = 'user'
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    @property
+    def fields(self):
+        return [f.name for f in self.model._meta.concrete_fields if f.name != 'user']
+
+
+COLLECTIONS = [
+    Collection('goals', 'tasks.Goal'),
+    Collection('projects', 'tasks.Project'),
+    Collection('tasks', 'tasks.Task'),
+    Collection('subtasks', 'tasks.Subtask', user_lookup='task__user'),
+    Collection('time_blocks', 'schedule.TimeBlock'),
+    Collection('habit_streaks', 'habits.HabitStreak'),
+    Collection('habit_states', 'habits.HabitState'),
+    Collection('checkins', 'habits.DailyCheckin'),
+    Collection('focus_sessions', 'focus.FocusSession'),
+]
+
+
+def collection_for(model):
+    for collection in COLLECTIONS:
+        if collection.model is model:
+            return collection
+    return None
@@ -0,0 +1,58 @@
+"""
+Write a tombstone whenever a synced row is deleted.
+
+Inside ``batched_signals()`` (bulk task writes and cascading destroys, see
+``common.batching.BatchedDestroyMixin``) the tombstones are collected and
+written with one ``bulk_create``.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete
+
+from common.batching import defer, flusher
+from .models import Tombstone
+from .registry import COLLECTIONS, collection_for
+
+
+def _origin_model(origin):
+    if isinstance(origin, QuerySet):
+        return origin.model
+    return type(origin) if origin is not None else None
+
+
+def _owner_id(collection, sender, instance, origin_model):
+    if collection.user_lookup == 'user':
+        return instance.user_id
+    # Rows owned through a parent (subtasks) are implied deleted when the
+    # parent goes, so only direct deletes need the extra owner lookup.
+    if origin_model is not sender:
+        return None
+    parent = sender._meta.get_field(collection.user_lookup.split('__')[0])
+    return (
+        parent.related_model.objects.filter(pk=getattr(instance, parent.attname))
+        .values_list('user_id', flat=True).first()
+    )
+
+
+def record_deletion(sender, instance, origin=None, **kwargs):
+    origin_model = _origin_model(origin)
+    if origin_model is get_user_model():
+        return  # account deletion: nobody left to sync
+    collection = collection_for(sender)
+    user_id = _owner_id(collection, sender, instance, origin_model)
+    if user_id is None:
+        return
+    tombstone = Tombstone(user_id=user_id, kind=collection.name, object_id=instance.pk)
+    if not defer('sync.tombstones', tombstone):
+        tombstone.save()
+
+
+@flusher('sync.tombstones')
+def _flush_tombstones(tombstones):
+    Tombstone.objects.bulk_create(tombstones)
+
+
+for _collection in COLLECTIONS:
+    post_delete.connect(
+        record_deletion, sender=_collection.model, dispatch_uid=f'sync-tombstone-{_collection.name}',
+    )
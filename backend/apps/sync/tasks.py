@@ -0,0 +1,16 @@
+"""Celery tasks for delta sync."""
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+
+@shared_task
+def purge_tombstones():
+    """Drop tombstones past retention; clients that old get a full snapshot instead."""
+    from .models import Tombstone
+
+    cutoff = timezone.now() - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+    deleted, _ = Tombstone.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,74 @@
+from datetime import timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .models import Tombstone
+from .registry import COLLECTIONS
+
+# A row saved in a transaction that commits after the response was built
+# carries an ``updated_at`` slightly before the cursor; stepping the cursor
+# back re-sends such rows instead of missing them. Clients upsert by id, so
+# the overlap is harmless.
+CURSOR_OVERLAP = timedelta(seconds=30)
+
+
+def format_cursor(moment):
+    return moment.astimezone(dt_timezone.utc).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+
+class SyncView(APIView):
+    """
+    GET /api/sync/?since=<cursor>
+
+    Rows changed since ``cursor`` across tasks, schedule, habits and focus,
+    plus ids deleted since then. Omit ``since`` (or send one older than the
+    tombstone retention) to get a full snapshot, flagged ``"full": true``,
+    which replaces the client's local copy. Store the returned ``cursor`` for
+    the next call.
+
+    Cascades are left to the client: subtasks deleted with their task get no
+    tombstone of their own, and references to a deleted task (a time block's
+    ``task``) should be cleared locally.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        now = timezone.now()
+        since = None
+        if 'since' in request.query_params:
+            since = parse_datetime(request.query_params['since'])
+            if since is None or timezone.is_naive(since):
+                return Response(
+                    {'detail': 'since must be a cursor returned by a previous sync.'},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        retention = timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+        full = since is None or since < now - retention
+
+        changes = {}
+        for collection in COLLECTIONS:
+            rows = collection.model.objects.filter(**{collection.user_lookup: request.user})
+            if not full:
+                rows = rows.filter(updated_at__gte=since)
+            rows = list(rows.order_by().values(*collection.fields))
+            if rows:
+                changes[collection.name] = rows
+
+        deleted = {}
+        if not full:
+            tombstones = Tombstone.objects.filter(user=request.user, created_at__gte=since)
+            for kind, object_id in tombstones.order_by().values_list('kind', 'object_id'):
+                deleted.setdefault(kind, []).append(object_id)
+
+        return Response({
+            'cursor': format_cursor(now - CURSOR_OVERLAP),
+            'full': full,
+            'changes': changes,
+            'deleted': deleted,
+        })
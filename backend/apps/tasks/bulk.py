@@ -0,0 +1,141 @@
+"""
+Batch create/update/delete of tasks (``POST /api/tasks/bulk/``).
+
+The whole batch is validated before anything is written and then persisted
+in one transaction with ``bulk_create``/``bulk_update`` and a single
+cascading delete, so an import of hundreds of tasks costs a handful of
+queries. ``bulk_create``/``bulk_update`` skip model signals, so ``post_save``
+is sent for each row inside ``batched_signals()``: rollup refreshes, cache
+bumps and tombstones still happen, once per batch rather than per row.
+"""
+import uuid
+
+from django.db import transaction
+from django.db.models import prefetch_related_objects
+from django.db.models.signals import post_save
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.analytics.signals import TASK_TRACKED_FIELDS
+from common.batching import batched_signals
+from .models import Project, Task
+from .serializers import TaskSerializer
+
+MAX_BULK_ITEMS = 500
+
+
+class OwnedProjectField(serializers.PrimaryKeyRelatedField):
+    """Resolves ids against the user's projects, loaded once per batch."""
+
+    def to_internal_value(self, data):
+        try:
+            return self.context['projects'][uuid.UUID(str(data))]
+        except (KeyError, ValueError, AttributeError):
+            self.fail('does_not_exist', pk_value=data)
+
+
+class BulkTaskSerializer(TaskSerializer):
+    project = OwnedProjectField(queryset=Project.objects.none(), required=False, allow_null=True)
+
+
+class BulkSerializer(serializers.Serializer):
+    create = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    update = serializers.ListField(child=serializers.DictField(), required=False, default=list)
+    delete = serializers.ListField(child=serializers.UUIDField(), required=False, default=list)
+
+    def validate(self, attrs):
+        if sum(len(items) for items in attrs.values()) > MAX_BULK_ITEMS:
+            raise serializers.ValidationError(f'At most {MAX_BULK_ITEMS} operations per request.')
+        return attrs
+
+
+def _validate(user, create, update, delete):
+    """
+    Validate every operation. Returns ``(errors, plan)`` where ``errors`` has
+    one entry per item (``{}`` when valid) under each operation that failed.
+    """
+    context = {'projects': Project.objects.filter(user=user).in_bulk()}
+    update_ids = []
+    for item in update:
+        try:
+            update_ids.append(uuid.UUID(str(item.get('id'))))
+        except ValueError:
+            update_ids.append(None)
+    tasks = (
+        Task.objects.filter(user=user).select_for_update()
+        .in_bulk([pk for pk in update_ids + delete if pk])
+    )
+
+    creates, create_errors = [], []
+    for item in create:
+        serializer = BulkTaskSerializer(data=item, context=context)
+        if serializer.is_valid():
+            creates.append(serializer.validated_data)
+        create_errors.append(serializer.errors)
+
+    updates, update_errors = [], []
+    for pk, item in zip(update_ids, update):
+        if pk not in tasks:
+            update_errors.append({'id': ['Unknown task.']})
+            continue
+        serializer = BulkTaskSerializer(tasks[pk], data=item, partial=True, context=context)
+        if serializer.is_valid():
+            updates.append((tasks[pk], serializer.validated_data))
+        update_errors.append(serializer.errors)
+
+    delete_errors = [{} if pk in tasks else {'id': ['Unknown task.']} for pk in delete]
+
+    errors = {
+        name: items
+        for name, items in (('create', create_errors), ('update', update_errors), ('delete', delete_errors))
+        if any(items)
+    }
+    return errors, (creates, updates, delete)
+
+
+def _apply_update(task, attrs, now):
+    # What the rollup receiver diffs against (its pre_save hook would cost a
+    # query per row).
+    task._rollup_previous = {field: getattr(task, field) for field in TASK_TRACKED_FIELDS}
+    if attrs.get('status') == 'done' and task.status != 'done':
+        task.completed_at = now
+    for field, value in attrs.items():
+        setattr(task, field, value)
+    task.updated_at = now
+    return set(attrs) | {'completed_at', 'updated_at'}
+
+
+def apply_bulk(user, create=(), update=(), delete=()):
+    """
+    Run a validated-as-a-whole batch for ``user``. Raises ``ValidationError``
+    with per-item errors, leaving the database untouched, if any item is
+    invalid. Returns ``(created, updated, deleted_ids)``.
+    """
+    with transaction.atomic(), batched_signals():
+        errors, (creates, updates, delete_ids) = _validate(user, create, update, delete)
+        if errors:
+            raise serializers.ValidationError(errors)
+
+        now = timezone.now()
+        created = Task.objects.bulk_create(Task(user=user, **attrs) for attrs in creates)
+
+        updated, fields = [], set()
+        for task, attrs in updates:
+            fields |= _apply_update(task, attrs, now)
+            updated.append(task)
+        if updated:
+            Task.objects.bulk_update(updated, sorted(fields))
+
+        if delete_ids:
+            Task.objects.filter(user=user, pk__in=delete_ids).delete()
+
+        using = Task.objects.db
+        for task in created:
+            post_save.send(sender=Task, instance=task, created=True, update_fields=None, raw=False, using=using)
+        for task in updated:
+            post_save.send(
+                sender=Task, instance=task, created=False, update_fields=frozenset(fields), raw=False, using=using,
+            )
+
+    prefetch_related_objects(created + updated, 'subtasks')
+    return created, updated, delete_ids
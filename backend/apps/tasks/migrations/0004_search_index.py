@@ -0,0 +1,90 @@
+"""
+Full-text search indexes for tasks, goals and projects (see apps.tasks.search).
+
+PostgreSQL gets GIN indexes on the weighted search vector and trigram GIN
+indexes on titles. SQLite gets an FTS5 table kept current by triggers.
+Neither changes model state, so both are applied through the schema editor
+for the current vendor only.
+"""
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+SEARCHABLE = (('task', 'Task', 'tasks'), ('goal', 'Goal', 'goals'), ('project', 'Project', 'projects'))
+
+
+def postgres_indexes(table):
+    vector = (
+        SearchVector('title', weight='A', config='english')
+        + SearchVector('description', weight='B', config='english')
+    )
+    return [
+        GinIndex(vector, name=f'{table}_search_idx'),
+        GinIndex(fields=['title'], opclasses=['gin_trgm_ops'], name=f'{table}_title_trgm_idx'),
+    ]
+
+
+FTS5_TABLE = (
+    "CREATE VIRTUAL TABLE search_index USING fts5("
+    "kind, object_id, user_id, title, description, tokenize='porter unicode61')"
+)
+FTS5_INSERT = (
+    "INSERT INTO search_index(kind, object_id, user_id, title, description) "
+    "VALUES ('{kind}', new.id, new.user_id, new.title, new.description);"
+)
+FTS5_DELETE = "DELETE FROM search_index WHERE search_index MATCH 'object_id:\"' || old.id || '\"';"
+
+
+def fts5_triggers(kind, table):
+    return [
+        f"CREATE TRIGGER {table}_search_ai AFTER INSERT ON {table} BEGIN "
+        f"{FTS5_INSERT.format(kind=kind)} END",
+        f"CREATE TRIGGER {table}_search_ad AFTER DELETE ON {table} BEGIN {FTS5_DELETE} END",
+        f"CREATE TRIGGER {table}_search_au AFTER UPDATE OF title, description, user_id ON {table} BEGIN "
+        f"{FTS5_DELETE} {FTS5_INSERT.format(kind=kind)} END",
+    ]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for _, model_name, table in SEARCHABLE:
+            model = apps.get_model('tasks', model_name)
+            for index in postgres_indexes(table):
+                schema_editor.add_index(model, index)
+    elif vendor == 'sqlite':
+        schema_editor.execute(FTS5_TABLE)
+        for kind, _, table in SEARCHABLE:
+            for trigger in fts5_triggers(kind, table):
+                schema_editor.execute(trigger)
+            schema_editor.execute(
+                f"INSERT INTO search_index(kind, object_id, user_id, title, description) "
+                f"SELECT '{kind}', id, user_id, title, description FROM {table}"
+            )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        for _, model_name, table in SEARCHABLE:
+            model = apps.get_model('tasks', model_name)
+            for index in postgres_indexes(table):
+                schema_editor.remove_index(model, index)
+    elif vendor == 'sqlite':
+        for _, _, table in SEARCHABLE:
+            for suffix in ('ai', 'ad', 'au'):
+                schema_editor.execute(f'DROP TRIGGER IF EXISTS {table}_search_{suffix}')
+        schema_editor.execute('DROP TABLE IF EXISTS search_index')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tasks', '0003_task_keyset_index'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,8 +1,42 @@
 from django.db import models
+from django.db.models import Count, Q
 from django.conf import settings
 from common.models import BaseModel
 
 
+class CountsQuerySet(models.QuerySet):
+    def _annotate_counts(self, **counts):
+        # Meta.ordering is dropped from GROUP BY queries, so restore it explicitly.
+        queryset = self.annotate(**counts)
+        if not queryset.query.order_by:
+            queryset = queryset.order_by(*self.model._meta.ordering)
+        return queryset
+
+
+class GoalQuerySet(CountsQuerySet):
+    def with_project_counts(self):
+        """Annotate ``project_count`` so list views don't count per row."""
+        return self._annotate_counts(project_count=Count('projects'))
+
+
+class ProjectQuerySet(CountsQuerySet):
+    def with_task_counts(self):
+        """Annotate ``task_count`` and ``completed_tasks`` in the same query."""
+        return self._annotate_counts(
+            task_count=Count('tasks'),
+            completed_tasks=Count('tasks', filter=Q(tasks__status='done')),
+        )
+
+
+class TaskQuerySet(CountsQuerySet):
+    def with_subtask_counts(self):
+        """Annotate ``subtask_count`` and ``completed_subtasks`` in the same query."""
+        return self._annotate_counts(
+            subtask_count=Count('subtasks'),
+            completed_subtasks=Count('subtasks', filter=Q(subtasks__is_completed=True)),
+        )
+
+
 class Goal(BaseModel):
     """Top-level objective container."""
     STATUS_CHOICES = [
@@ -18,6 +52,8 @@ class Goal(BaseModel):
     target_date = models.DateField(null=True, blank=True)
     progress_pct = models.IntegerField(default=0)
 
+    objects = GoalQuerySet.as_manager()
+
     class Meta:
         db_table = 'goals'
         ordering = ['-created_at']
@@ -45,6 +81,8 @@ class Project(BaseModel):
     color = models.CharField(max_length=7, default='#6366f1')
     sort_order = models.IntegerField(default=0)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         db_table = 'projects'
         ordering = ['sort_order', '-created_at']
@@ -91,11 +129,28 @@ class Task(BaseModel):
     sort_order = models.IntegerField(default=0)
     completed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = TaskQuerySet.as_manager()
+
     class Meta:
         db_table = 'tasks'
         ordering = ['sort_order', '-created_at']
         indexes = [
-            models.Index(fields=['user', 'status', 'due_date']),
+            # Partial indexes for the hot predicates: open tasks by due date
+            # (risk detection, overview, reminders) and done tasks by
+            # completion time (rollup, burndown). Queries must repeat the
+            # exact status condition for the planner to pick them.
+            models.Index(
+                fields=['user', 'due_date'], name='tasks_open_due_idx',
+                condition=models.Q(status__in=['todo', 'in_progress']),
+            ),
+            models.Index(
+                fields=['user', 'completed_at'], name='tasks_done_completed_idx',
+                condition=models.Q(status='done'),
+            ),
+            # Cross-user notification sweeps.
+            models.Index(fields=['status', 'due_date'], name='tasks_status_due_idx'),
+            models.Index(fields=['user', 'sort_order', '-created_at']),
+            models.Index(fields=['user', 'created_at']),
             models.Index(fields=['project', 'sort_order']),
             models.Index(fields=['user', 'is_recurring']),
         ]
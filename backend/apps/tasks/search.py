@@ -0,0 +1,184 @@
+"""
+Full-text search over tasks, goals and projects.
+
+PostgreSQL: a weighted ``SearchVector`` (title A, description B) matched with
+a web-search style query and backed by GIN expression indexes, plus trigram
+similarity on titles (GIN ``gin_trgm_ops``) so typos still find something.
+SQLite (local development): an FTS5 table, ``search_index``, kept current by
+triggers. Both are created by migration 0004. Other backends fall back to
+``icontains``.
+
+Matching is by word, with the last word as a prefix, rather than by
+substring: ``?search=port`` finds "Port migration" but not "Write report".
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.db.models import F, Q
+from rest_framework import filters
+
+from .models import Goal, Project, Task
+
+SEARCH_CONFIG = 'english'
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 50
+# bm25 column weights for (kind, object_id, user_id, title, description)
+FTS5_WEIGHTS = (0, 0, 0, 10, 1)
+
+SEARCHABLE = {'task': Task, 'goal': Goal, 'project': Project}
+# Indexed columns and their SearchVector weights, in index order.
+SEARCH_COLUMNS = {'title': 'A', 'description': 'B'}
+RESULT_FIELDS = ('id', 'title', 'status')
+
+_word = re.compile(r'\w+')
+
+
+def search_vector(fields=tuple(SEARCH_COLUMNS)):
+    """Over every column this must match the GIN expression indexes in migration 0004."""
+    vectors = [SearchVector(field, weight=SEARCH_COLUMNS[field], config=SEARCH_CONFIG) for field in fields]
+    vector = vectors[0]
+    for other in vectors[1:]:
+        vector = vector + other
+    return vector
+
+
+def kind_of(model):
+    return next(kind for kind, searchable in SEARCHABLE.items() if searchable is model)
+
+
+def fts5_query(user, text, kind=None, fields=tuple(SEARCH_COLUMNS)):
+    """
+    FTS5 MATCH expression for ``text``: every word must match one of
+    ``fields``, the last one as a prefix (search-as-you-type). User input
+    is reduced to quoted word tokens, so it can't inject query syntax.
+    """
+    words = _word.findall(text)
+    if not words:
+        return None
+    terms = ' '.join(f'"{w}"' for w in words) + '*'
+    scope = f'user_id:"{user.pk.hex}"'
+    if kind:
+        scope += f' AND kind:"{kind}"'
+    columns = ' '.join(fields)
+    return f'{scope} AND {{{columns}}}: ({terms})'
+
+
+def _fts5_rows(user, text, limit, kind=None, fields=tuple(SEARCH_COLUMNS)):
+    match = fts5_query(user, text, kind, fields)
+    if match is None:
+        return []
+    weights = ', '.join(str(w) for w in FTS5_WEIGHTS)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT kind, object_id, -bm25(search_index, {weights}) AS rank FROM search_index '
+            f'WHERE search_index MATCH %s ORDER BY rank DESC LIMIT %s',
+            [match, limit],
+        )
+        return cursor.fetchall()
+
+
+def matching(queryset, user, text, fields=tuple(SEARCH_COLUMNS)):
+    """Restrict ``queryset`` (tasks, goals or projects) to rows whose ``fields`` match ``text``."""
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        query = Q(search=SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG))
+        if 'title' in fields:
+            query |= Q(title__trigram_similar=text)
+        return queryset.annotate(search=search_vector(fields)).filter(query)
+    if vendor == 'sqlite':
+        rows = _fts5_rows(user, text, limit=-1, kind=kind_of(queryset.model), fields=fields)
+        return queryset.filter(pk__in=[object_id for _, object_id, _ in rows])
+    query = Q()
+    for field in fields:
+        query |= Q(**{f'{field}__icontains': text})
+    return queryset.filter(query)
+
+
+def _postgres_search(user, text, limit):
+    query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+    results = []
+    for kind, model in SEARCHABLE.items():
+        rows = (
+            model.objects.filter(user=user)
+            .annotate(search=search_vector())
+            .filter(search=query)
+            .annotate(rank=SearchRank(F('search'), query))
+            .order_by('-rank')
+            .values(*RESULT_FIELDS, 'rank')[:limit]
+        )
+        results += [{'type': kind, **row} for row in rows]
+    if len(results) < limit:
+        # Trigram fallback for misspelled words; ranked below every text match.
+        found = [row['id'] for row in results]
+        for kind, model in SEARCHABLE.items():
+            rows = (
+                model.objects.filter(user=user, title__trigram_similar=text)
+                .exclude(pk__in=found)
+                .annotate(rank=TrigramSimilarity('title', text) - 1)
+                .order_by('-rank')
+                .values(*RESULT_FIELDS, 'rank')[:limit]
+            )
+            results += [{'type': kind, **row} for row in rows]
+    return results
+
+
+def _sqlite_search(user, text, limit):
+    ranked = _fts5_rows(user, text, limit)
+    ids = {}
+    for kind, object_id, _ in ranked:
+        ids.setdefault(kind, []).append(object_id)
+    rows = {}
+    for kind, object_ids in ids.items():
+        for row in SEARCHABLE[kind].objects.filter(user=user, pk__in=object_ids).values(*RESULT_FIELDS):
+            rows[row['id'].hex] = row
+    return [
+        {'type': kind, **rows[object_id], 'rank': rank}
+        for kind, object_id, rank in ranked if object_id in rows
+    ]
+
+
+def _fallback_search(user, text, limit):
+    results = []
+    for kind, model in SEARCHABLE.items():
+        rows = matching(model.objects.filter(user=user), user, text).values(*RESULT_FIELDS)[:limit]
+        results += [{'type': kind, **row, 'rank': 0} for row in rows]
+    return results
+
+
+def search(user, text, limit=SEARCH_LIMIT):
+    """Ranked matches for ``text`` across the user's tasks, goals and projects."""
+    text = text.strip()
+    if not text:
+        return []
+    vendor = connection.vendor
+    if vendor == 'postgresql':
+        results = _postgres_search(user, text, limit)
+    elif vendor == 'sqlite':
+        results = _sqlite_search(user, text, limit)
+    else:
+        results = _fallback_search(user, text, limit)
+    results.sort(key=lambda row: row['rank'], reverse=True)
+    return results[:limit]
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index instead of ``ILIKE '%q%'`` scans.
+
+    The view's ``search_fields`` pick the indexed columns to match; only
+    those in ``SEARCH_COLUMNS`` are supported.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        text = request.query_params.get(self.search_param, '').strip()
+        if not text:
+            return queryset
+        fields = self.get_search_fields(view, request) or SEARCH_COLUMNS
+        unknown = set(fields) - set(SEARCH_COLUMNS)
+        if unknown:
+            raise ImproperlyConfigured(
+                f"{type(view).__name__}.search_fields: {', '.join(sorted(unknown))} not in the search index"
+            )
+        return matching(queryset, request.user, text, tuple(f for f in SEARCH_COLUMNS if f in fields))
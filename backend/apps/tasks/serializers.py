@@ -2,6 +2,12 @@ from rest_framework import serializers
 from .models import Goal, Project, Task, Subtask, Tag
 
 
+def annotated_or(obj, name, fallback):
+    """Prefer a queryset annotation; only query when the instance wasn't annotated."""
+    value = getattr(obj, name, None)
+    return fallback() if value is None else value
+
+
 class SubtaskSerializer(serializers.ModelSerializer):
     class Meta:
         model = Subtask
@@ -25,11 +31,12 @@ class TaskSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ['id', 'completed_at', 'created_at', 'updated_at']
 
+    # Counted from the prefetched ``subtasks`` rather than issuing new queries.
     def get_subtask_count(self, obj):
-        return obj.subtasks.count()
+        return len(obj.subtasks.all())
 
     def get_completed_subtasks(self, obj):
-        return obj.subtasks.filter(is_completed=True).count()
+        return sum(1 for subtask in obj.subtasks.all() if subtask.is_completed)
 
 
 class TaskListSerializer(serializers.ModelSerializer):
@@ -47,10 +54,10 @@ class TaskListSerializer(serializers.ModelSerializer):
         ]
 
     def get_subtask_count(self, obj):
-        return obj.subtasks.count()
+        return annotated_or(obj, 'subtask_count', obj.subtasks.count)
 
     def get_completed_subtasks(self, obj):
-        return obj.subtasks.filter(is_completed=True).count()
+        return annotated_or(obj, 'completed_subtasks', obj.subtasks.filter(is_completed=True).count)
 
 
 class QuickCaptureSerializer(serializers.ModelSerializer):
@@ -75,10 +82,10 @@ class ProjectSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'created_at', 'updated_at']
 
     def get_task_count(self, obj):
-        return obj.tasks.count()
+        return annotated_or(obj, 'task_count', obj.tasks.count)
 
     def get_completed_tasks(self, obj):
-        return obj.tasks.filter(status='done').count()
+        return annotated_or(obj, 'completed_tasks', obj.tasks.filter(status='done').count)
 
 
 class GoalSerializer(serializers.ModelSerializer):
@@ -95,7 +102,7 @@ class GoalSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'progress_pct', 'created_at', 'updated_at']
 
     def get_project_count(self, obj):
-        return obj.projects.count()
+        return len(obj.projects.all())
 
 
 class GoalListSerializer(serializers.ModelSerializer):
@@ -107,7 +114,7 @@ class GoalListSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'status', 'target_date', 'progress_pct', 'created_at', 'project_count']
 
     def get_project_count(self, obj):
-        return obj.projects.count()
+        return annotated_or(obj, 'project_count', obj.projects.count)
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -2,11 +2,19 @@ from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
+from django.db.models import Prefetch
 from django.utils import timezone
 
+from common.batching import BatchedDestroyMixin
+from common.conditional import ConditionalListMixin
+from common.ordering import MAX_REORDER_ITEMS, MoveSerializer, ReorderItemSerializer, bulk_reorder, move_between
+from common.pagination import KeysetPagination
 from common.permissions import IsOwner
+from .bulk import BulkSerializer, apply_bulk
 from .models import Goal, Project, Task, Subtask, Tag
+from .search import MAX_SEARCH_LIMIT, SEARCH_LIMIT, FullTextSearchFilter, search
 from .serializers import (
     GoalSerializer, GoalListSerializer,
     ProjectSerializer,
@@ -15,15 +23,21 @@ from .serializers import (
 )
 
 
-class GoalViewSet(viewsets.ModelViewSet):
+class GoalViewSet(BatchedDestroyMixin, ConditionalListMixin, viewsets.ModelViewSet):
     """CRUD for Goals."""
+    etag_related = ('projects',)
     permission_classes = [IsAuthenticated, IsOwner]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['status']
     search_fields = ['title', 'description']
 
     def get_queryset(self):
-        return Goal.objects.filter(user=self.request.user).prefetch_related('projects')
+        queryset = Goal.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            return queryset.with_project_counts()
+        return queryset.prefetch_related(
+            Prefetch('projects', queryset=Project.objects.with_task_counts())
+        )
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -34,15 +48,15 @@ class GoalViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class ProjectViewSet(viewsets.ModelViewSet):
+class ProjectViewSet(BatchedDestroyMixin, viewsets.ModelViewSet):
     """CRUD for Projects."""
     permission_classes = [IsAuthenticated, IsOwner]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter]
     filterset_fields = ['goal', 'status']
     search_fields = ['title']
 
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user).prefetch_related('tasks')
+        return Project.objects.filter(user=self.request.user).with_task_counts()
 
     def get_serializer_class(self):
         return ProjectSerializer
@@ -51,16 +65,22 @@ class ProjectViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class TaskViewSet(viewsets.ModelViewSet):
+class TaskViewSet(BatchedDestroyMixin, ConditionalListMixin, viewsets.ModelViewSet):
     """Full CRUD for Tasks with filtering, search, and custom actions."""
+    etag_related = ('subtasks',)
+    pagination_class = KeysetPagination
+    cursor_ordering = ('sort_order', '-created_at')
     permission_classes = [IsAuthenticated, IsOwner]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, filters.OrderingFilter]
     filterset_fields = ['project', 'status', 'priority', 'energy_level', 'is_recurring']
     search_fields = ['title', 'description']
     ordering_fields = ['due_date', 'priority', 'created_at', 'sort_order']
 
     def get_queryset(self):
-        return Task.objects.filter(user=self.request.user).prefetch_related('subtasks')
+        queryset = Task.objects.filter(user=self.request.user)
+        if self.action == 'list':
+            return queryset.with_subtask_counts()
+        return queryset.prefetch_related('subtasks')
 
     def get_serializer_class(self):
         if self.action == 'list':
@@ -91,14 +111,41 @@ class TaskViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['patch'])
     def reorder(self, request):
-        """Bulk update sort order for drag-and-drop."""
-        items = request.data.get('items', [])
-        for item in items:
-            Task.objects.filter(id=item['id'], user=request.user).update(
-                sort_order=item['sort_order']
-            )
+        """Bulk update sort order for drag-and-drop in one statement."""
+        serializer = ReorderItemSerializer(
+            data=request.data.get('items', []), many=True, max_length=MAX_REORDER_ITEMS,
+        )
+        serializer.is_valid(raise_exception=True)
+        bulk_reorder(Task.objects.filter(user=request.user), serializer.validated_data)
         return Response({'detail': 'Reordered successfully.'})
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create, update and delete many tasks in one transaction:
+        ``{"create": [task, ...], "update": [{"id", ...fields}], "delete": [id, ...]}``.
+        Nothing is written if any item is invalid; errors are returned per item.
+        """
+        serializer = BulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, updated, deleted = apply_bulk(request.user, **serializer.validated_data)
+        return Response({
+            'created': TaskSerializer(created, many=True).data,
+            'updated': TaskSerializer(updated, many=True).data,
+            'deleted': [str(pk) for pk in deleted],
+        }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def move(self, request, pk=None):
+        """Drop a task between two neighbours, rewriting only its own sort order."""
+        task = self.get_object()
+        serializer = MoveSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = move_between(Task.objects.filter(user=request.user), task, **serializer.validated_data)
+        return Response({
+            'items': [{'id': str(t.id), 'sort_order': t.sort_order} for t in updated],
+        })
+
     @action(detail=True, methods=['post'], url_path='ai-breakdown')
     def ai_breakdown(self, request, pk=None):
         """AI-powered task decomposition (placeholder)."""
@@ -143,3 +190,22 @@ class TagViewSet(viewsets.ModelViewSet):
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+class SearchView(APIView):
+    """
+    GET /api/search/?q=<text>&limit=<n>
+
+    Ranked full-text matches across the user's tasks, goals and projects,
+    best first: ``[{type, id, title, status, rank}]``.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', SEARCH_LIMIT))
+        except ValueError:
+            limit = SEARCH_LIMIT
+        limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+        results = search(request.user, request.query_params.get('q', ''), limit)
+        return Response({'results': results})
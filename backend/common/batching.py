@@ -0,0 +1,66 @@
+"""
+Coalescing of per-row signal side effects during bulk writes.
+
+Receivers that would otherwise do work per row (schedule a rollup refresh,
+bump a cache version, write a tombstone) first offer the work to ``defer``.
+Inside a ``batched_signals()`` block it is queued under a key and handed to
+that key's flusher once, as a list, when the block exits cleanly; outside
+one, ``defer`` returns False and the receiver does the work itself.
+
+Flushers run in registration order, so a receiver module can rely on e.g.
+rollups being scheduled before the cache bump that exposes them.
+
+Deleting a goal or project cascades to every task under it, and each row
+sends ``post_delete``; ``BatchedDestroyMixin`` runs a viewset's destroy in
+one batch so the cascade costs one rollup refresh and one tombstone insert.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import transaction
+
+_batch = ContextVar('signal_batch', default=None)
+_flushers = {}
+
+
+def flusher(key):
+    """Register the function that receives every item deferred under ``key``."""
+    def register(func):
+        _flushers[key] = func
+        return func
+    return register
+
+
+def defer(key, item):
+    """Queue ``item`` if a batch is open; False means the caller handles it now."""
+    batch = _batch.get()
+    if batch is None:
+        return False
+    batch.setdefault(key, []).append(item)
+    return True
+
+
+@contextmanager
+def batched_signals():
+    """
+    Collect deferred side effects until the block exits. Nothing is flushed
+    if it raises, so wrap it in (or around) the same ``transaction.atomic``
+    as the writes.
+    """
+    batch = {}
+    token = _batch.set(batch)
+    try:
+        yield
+    finally:
+        _batch.reset(token)
+    for key, func in _flushers.items():
+        if key in batch:
+            func(batch[key])
+
+
+class BatchedDestroyMixin:
+    """Delete the object, and everything it cascades to, inside one batch."""
+
+    def perform_destroy(self, instance):
+        with transaction.atomic(), batched_signals():
+            super().perform_destroy(instance)
@@ -0,0 +1,123 @@
+"""Small in-process caches, and per-user versioned response caching."""
+import hashlib
+import time
+from collections import OrderedDict
+from functools import wraps
+from threading import Lock
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from common.dates import user_today
+
+USER_RESPONSE_TTL = 60 * 5
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after ``ttl`` seconds.
+
+    Meant for hot, per-process lookups where a bounded amount of staleness is
+    acceptable; use Django's cache framework for anything shared.
+    """
+
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[1] if entry else None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses}
+
+
+def _version_key(user_id, namespace):
+    return f'{namespace}:{user_id}'
+
+
+def get_user_version(user_id, namespace='user-version'):
+    """
+    Current cache version for ``user_id``.
+
+    A missing version (first use, or evicted) starts from the clock rather
+    than 1 so it can never collide with responses cached under an old one.
+    ``namespace`` keeps independent caches from invalidating each other.
+    """
+    key = _version_key(user_id, namespace)
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_user_version(user_id, namespace='user-version'):
+    """Invalidate everything cached for ``user_id`` under ``namespace`` (by default, responses)."""
+    key = _version_key(user_id, namespace)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+
+
+def cache_user_response(timeout=USER_RESPONSE_TTL):
+    """
+    Cache a view's successful GET responses per user until their data changes.
+
+    The key includes the user's version (see ``bump_user_version``), the
+    request path and query string, and today's date so date-relative numbers
+    roll over at midnight. ``timeout`` bounds staleness for anything that
+    changes with the clock alone, such as tasks becoming overdue.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            user_id = request.user.pk
+            path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+            key = (
+                f'response:{type(self).__name__}:{user_id}:{get_user_version(user_id)}:'
+                f'{user_today(request.user).isoformat()}:{path}'
+            )
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                cache.set(key, response.data, timeout)
+            return response
+        return wrapper
+    return decorator
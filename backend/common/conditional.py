@@ -0,0 +1,63 @@
+"""
+Conditional GET (``ETag`` / ``If-None-Match``) for list endpoints.
+
+The ETag is derived from one aggregate query over the same queryset the
+list would serialize: its row count and newest ``updated_at``, plus the same
+pair for any related rows the representation depends on (subtask counts,
+task titles, ...). Inserts, edits and deletes all move one of those, so a
+matching ETag means the list is unchanged and ``304 Not Modified`` is sent
+without serializing anything.
+
+Writes that bypass ``save()`` must set ``updated_at`` themselves for this to
+hold (see ``common.ordering._touch``).
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
+
+CACHE_CONTROL = 'private, no-cache'
+
+
+def queryset_etag(queryset, related=(), *extra):
+    """ETag for ``queryset``, its ``related`` relations and any ``extra`` values."""
+    aggregates = {'rows': Count('pk', distinct=True), 'changed': Max('updated_at')}
+    for name in related:
+        aggregates[f'{name}_rows'] = Count(name, distinct=True)
+        aggregates[f'{name}_changed'] = Max(f'{name}__updated_at')
+    state = queryset.order_by().aggregate(**aggregates)
+    raw = repr((sorted(state.items()), extra))
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+def conditional(request, etag, render):
+    """
+    Return ``304 Not Modified`` if the client already has ``etag``, otherwise
+    ``render()``. Either way the response carries the ETag and asks the
+    browser to revalidate, so plain refetches get the 304 for free.
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = render()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        response['Cache-Control'] = CACHE_CONTROL
+    return response
+
+
+class ConditionalListMixin:
+    """
+    Add ETag support to a viewset's ``list`` action.
+
+    ``etag_related`` names relations whose rows appear in the list
+    representation and so must invalidate it too.
+    """
+    etag_related = ()
+
+    def list(self, request, *args, **kwargs):
+        etag = queryset_etag(
+            self.filter_queryset(self.get_queryset()), self.etag_related,
+            request.user.pk, request.get_full_path(),
+        )
+        return conditional(request, etag, lambda: super(ConditionalListMixin, self).list(request, *args, **kwargs))
@@ -0,0 +1,55 @@
+"""
+Calendar days in the user's own timezone.
+
+"Today", per-day rollups and date filters all follow ``User.timezone``
+rather than the server's UTC. Two rules keep this cheap:
+
+* Filters on a datetime column use ``day_bounds``, the UTC instants at
+  which the local days start and end. A column compared against a range
+  stays sargable, so the usual indexes still apply. Never cast the column
+  (``completed_at__date=``) for a filter.
+* Grouping converts in SQL with ``day_trunc`` (``TruncDate``/``Trunc`` with
+  ``tzinfo``), never row by row in Python.
+"""
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db.models import DateField
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+
+@lru_cache(maxsize=None)
+def get_zone(name):
+    """``ZoneInfo`` for an IANA name; unknown or empty names fall back to UTC."""
+    try:
+        return ZoneInfo(name) if name else dt_timezone.utc
+    except (ZoneInfoNotFoundError, ValueError):
+        return dt_timezone.utc
+
+
+def user_zone(user):
+    return get_zone(getattr(user, 'timezone', None))
+
+
+def local_date(value, tz):
+    """Calendar date of the aware datetime ``value`` in ``tz``."""
+    return value.astimezone(tz).date()
+
+
+def user_today(user, now=None):
+    return local_date(now or timezone.now(), user_zone(user))
+
+
+def day_bounds(start, end, tz):
+    """Aware datetimes spanning ``start`` 00:00 up to (excluding) the day after ``end``, in ``tz``."""
+    return (
+        datetime.combine(start, time.min, tzinfo=tz),
+        datetime.combine(end + timedelta(days=1), time.min, tzinfo=tz),
+    )
+
+
+def day_trunc(field, tz, kind='day'):
+    """SQL expression truncating ``field`` to a local ``kind`` (day/week/month) date in ``tz``."""
+    return Trunc(field, kind, output_field=DateField(), tzinfo=tz)
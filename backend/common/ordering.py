@@ -0,0 +1,154 @@
+"""
+Drag-and-drop ordering helpers shared by sortable models.
+
+Two modes are supported:
+
+* ``bulk_reorder`` — the client sends the new ``sort_order`` of many rows;
+  ownership is checked with one SELECT and everything is written with a
+  single ``UPDATE ... CASE`` inside a transaction.
+* ``move_between`` — gap-based ordering: the client names the neighbours the
+  row was dropped between and only that row is rewritten, unless the gap is
+  exhausted, in which case a small slice around the drop point is respaced.
+"""
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+ORDER_GAP = 1024
+MAX_REORDER_ITEMS = 500
+# When a gap runs out, respace this many rows either side of the drop point,
+# widening the slice until its rows are at least MIN_RENUMBER_GAP apart.
+RENUMBER_RADIUS = 8
+MIN_RENUMBER_GAP = ORDER_GAP // 2
+
+
+class ReorderItemSerializer(serializers.Serializer):
+    id = serializers.UUIDField()
+    sort_order = serializers.IntegerField()
+
+
+class MoveSerializer(serializers.Serializer):
+    """Neighbours of the dropped row; omit both to move it to the end."""
+    after = serializers.UUIDField(required=False, allow_null=True)
+    before = serializers.UUIDField(required=False, allow_null=True)
+
+
+def _touch(model, objects, fields):
+    fields = list(fields)
+    if any(f.name == 'updated_at' for f in model._meta.fields):
+        now = timezone.now()
+        for obj in objects:
+            obj.updated_at = now
+        fields.append('updated_at')
+    model.objects.bulk_update(objects, fields)
+
+
+def bulk_reorder(queryset, items, fields=('sort_order',)):
+    """
+    Apply validated reorder ``items`` to rows of ``queryset``.
+
+    ``queryset`` must already be scoped to the requesting user; ids outside it
+    reject the whole request. Item values that are ``None`` or missing leave
+    the stored value untouched. Returns the number of rows updated.
+    """
+    ids = [item['id'] for item in items]
+    with transaction.atomic():
+        objects = queryset.select_for_update().in_bulk(ids)
+        missing = [str(pk) for pk in ids if pk not in objects]
+        if missing:
+            raise serializers.ValidationError({'items': [f"Unknown ids: {', '.join(missing)}"]})
+
+        for item in items:
+            obj = objects[item['id']]
+            for field in fields:
+                if item.get(field) is not None:
+                    setattr(obj, field, item[field])
+        if objects:
+            _touch(queryset.model, list(objects.values()), fields)
+    return len(objects)
+
+
+def move_between(queryset, obj, after=None, before=None):
+    """
+    Give ``obj`` a ``sort_order`` between the rows ``after`` and ``before``.
+
+    Returns the list of rows written: just ``obj`` while there is room in the
+    gap, or the respaced slice around it (see ``_renumber``).
+    """
+    with transaction.atomic():
+        neighbours = queryset.select_for_update().in_bulk([pk for pk in (after, before) if pk])
+        for pk in (after, before):
+            if pk and pk not in neighbours:
+                raise serializers.ValidationError({'detail': f'Unknown neighbour: {pk}'})
+
+        lower = neighbours[after].sort_order if after else None
+        upper = neighbours[before].sort_order if before else None
+        if lower is None and upper is None:
+            last = queryset.exclude(pk=obj.pk).order_by('-sort_order').values_list('sort_order', flat=True).first()
+            lower = last if last is not None else -ORDER_GAP
+
+        if upper is None:
+            position = lower + ORDER_GAP
+        elif lower is None:
+            position = upper - ORDER_GAP
+        elif upper - lower > 1:
+            position = (lower + upper) // 2
+        else:
+            return _renumber(queryset, obj, after, before)
+
+        obj.sort_order = position
+        _touch(queryset.model, [obj], ['sort_order'])
+        return [obj]
+
+
+def _window(rows, index, radius):
+    """
+    Positions for the slice of ``rows`` within ``radius`` of ``index`` plus
+    the dropped row, or ``None`` if its outer neighbours leave less than
+    ``MIN_RENUMBER_GAP`` per row. A slice reaching an end of the list has no
+    bound on that side.
+    """
+    start, end = max(index - radius, 0), min(index + radius, len(rows))
+    count = end - start + 1
+    lower = rows[start - 1][1] if start > 0 else None
+    upper = rows[end][1] if end < len(rows) else None
+    if lower is None and upper is None:
+        first, step = ORDER_GAP, ORDER_GAP
+    elif upper is None:
+        first, step = lower + ORDER_GAP, ORDER_GAP
+    elif lower is None:
+        first, step = upper - count * ORDER_GAP, ORDER_GAP
+    else:
+        step = (upper - lower) // (count + 1)
+        if step < MIN_RENUMBER_GAP:
+            return None
+        first = lower + step
+    return start, end, [first + i * step for i in range(count)]
+
+
+def _renumber(queryset, obj, after, before):
+    """
+    Respace the rows around the drop point once the gap there is used up.
+
+    The slice starts ``RENUMBER_RADIUS`` rows either side and doubles until
+    its outer neighbours leave room, so a drag rewrites a few rows rather
+    than every row in ``queryset``. Returns the rewritten rows in order.
+    """
+    rows = list(
+        queryset.select_for_update().exclude(pk=obj.pk)
+        .order_by('sort_order', '-created_at').values_list('pk', 'sort_order')
+    )
+    ids = [pk for pk, _ in rows]
+    index = ids.index(after) + 1 if after else ids.index(before)
+
+    radius = RENUMBER_RADIUS
+    while (window := _window(rows, index, radius)) is None:
+        radius *= 2
+    start, end, positions = window
+
+    objects = queryset.in_bulk(ids[start:end])
+    ordered = [objects[pk] for pk in ids[start:index]] + [obj] + [objects[pk] for pk in ids[index:end]]
+    for row, position in zip(ordered, positions):
+        row.sort_order = position
+    _touch(queryset.model, ordered, ['sort_order'])
+    return ordered
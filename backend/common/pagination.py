@@ -1,4 +1,12 @@
-from rest_framework.pagination import CursorPagination, PageNumberPagination
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
 
 class StandardPagination(PageNumberPagination):
@@ -10,3 +18,109 @@ class StandardPagination(PageNumberPagination):
 class TimelinePagination(CursorPagination):
     page_size = 20
     ordering = '-created_at'
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset ("seek") pagination over the view's ``cursor_ordering``.
+
+    The primary key is appended as a tiebreaker and the cursor holds the last
+    row's value for every ordering field, so the next page is one indexed
+    range scan however deep it is and however many rows share a sort value.
+    Unlike DRF's ``CursorPagination``, which seeks on the first field only and
+    falls back to OFFSET within ties, this stays fast for e.g. tasks that all
+    have ``sort_order`` 0. No ``COUNT(*)`` is issued.
+
+    Requests with ``?page=`` (clients that need totals) or ``?ordering=``
+    (which may sort on nullable columns) get ``StandardPagination`` instead.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    fallback_class = StandardPagination
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.fallback = None
+        if self.fallback_class.page_query_param in request.query_params or 'ordering' in request.query_params:
+            self.fallback = self.fallback_class()
+            return self.fallback.paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.model = queryset.model
+        last = view.cursor_ordering[-1]
+        self.ordering = [*view.cursor_ordering, '-pk' if last.startswith('-') else 'pk']
+
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(cursor))
+        rows = list(queryset.order_by(*self.ordering)[:page_size + 1])
+
+        self.next_cursor = self.encode_cursor(rows[page_size - 1]) if len(rows) > page_size else None
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.fallback is not None:
+            return self.fallback.get_paginated_response(data)
+        return Response({'next': self.get_next_link(), 'results': data})
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def _fields(self):
+        return [
+            self.model._meta.pk if name.lstrip('-') == 'pk' else self.model._meta.get_field(name.lstrip('-'))
+            for name in self.ordering
+        ]
+
+    def after(self, values):
+        """Rows strictly after ``values`` in ``self.ordering`` (lexicographic)."""
+        condition, equal = Q(), {}
+        for name, value in zip(self.ordering, values):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{field}__{lookup}': value})
+            equal[field] = value
+        return condition
+
+    def encode_cursor(self, row):
+        # value_to_string keeps full microsecond precision (DjangoJSONEncoder
+        # would round datetimes to milliseconds and skip rows on the boundary).
+        values = [field.value_to_string(row) for field in self._fields()]
+        raw = json.dumps(values).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [field.to_python(value) for field, value in zip(fields, values)]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
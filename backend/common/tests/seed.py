@@ -0,0 +1,167 @@
+"""
+Realistic per-user fixtures for performance tests.
+
+Everything is inserted with ``bulk_create`` so seeding thousands of rows
+stays fast; derived tables (the analytics rollup) are rebuilt afterwards.
+"""
+from dataclasses import dataclass
+from datetime import time, timedelta
+from types import SimpleNamespace
+
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+
+from apps.analytics.rollup import rebuild_history
+from apps.chatbot.models import ChatMessage, Conversation
+from apps.focus.models import FocusSession
+from apps.habits.models import DailyCheckin, HabitState, HabitStreak
+from apps.notifications.models import Notification
+from apps.schedule.models import TimeBlock
+from apps.tasks.models import Goal, Project, Subtask, Task
+
+PRIORITIES = ['P1', 'P2', 'P3', 'P4']
+ENERGY_LEVELS = ['low', 'medium', 'high']
+
+
+@dataclass(frozen=True)
+class SeedSize:
+    goals: int
+    projects_per_goal: int
+    open_tasks: int
+    done_tasks: int
+    subtasks_per_task: int
+    habits: int
+    habit_days: int
+    focus_sessions: int
+    blocks_this_week: int
+    notifications: int
+    checkins: int
+    conversations: int
+    chat_turns: int
+
+
+SMALL = SeedSize(
+    goals=1, projects_per_goal=2, open_tasks=10, done_tasks=20, subtasks_per_task=2,
+    habits=2, habit_days=5, focus_sessions=10, blocks_this_week=3, notifications=5, checkins=5,
+    conversations=2, chat_turns=4,
+)
+LARGE = SeedSize(
+    goals=8, projects_per_goal=5, open_tasks=300, done_tasks=3000, subtasks_per_task=3,
+    habits=30, habit_days=120, focus_sessions=1500, blocks_this_week=40, notifications=300, checkins=120,
+    conversations=40, chat_turns=60,
+)
+
+
+def seed_user(email, size):
+    """Create a user with ``size`` worth of history and return handles to sample rows."""
+    user = get_user_model().objects.create_user(
+        email=email, username=email.split('@')[0], password='seed-password-123',
+    )
+    now = timezone.now()
+    today = now.date()
+
+    goals = Goal.objects.bulk_create(
+        Goal(user=user, title=f'Goal {i}', description='Seeded goal') for i in range(size.goals)
+    )
+    projects = Project.objects.bulk_create(
+        Project(user=user, goal=goal, title=f'{goal.title} / Project {j}', sort_order=j)
+        for goal in goals for j in range(size.projects_per_goal)
+    )
+
+    def task(i, **kwargs):
+        fields = {
+            'user': user,
+            'project': projects[i % len(projects)],
+            'title': f'Task {i}',
+            'description': 'Seeded task with a short description.',
+            'priority': PRIORITIES[i % len(PRIORITIES)],
+            'energy_level': ENERGY_LEVELS[i % len(ENERGY_LEVELS)],
+            'sort_order': i,
+        }
+        fields.update(kwargs)
+        return Task(**fields)
+
+    open_tasks = Task.objects.bulk_create(
+        task(i, status='todo' if i % 3 else 'in_progress', due_date=now + timedelta(hours=6 * (i % 20) - 60))
+        for i in range(size.open_tasks)
+    )
+    Task.objects.bulk_create(
+        task(size.open_tasks + i, status='done', completed_at=now - timedelta(hours=3 * i))
+        for i in range(size.done_tasks)
+    )
+    habits = Task.objects.bulk_create(
+        task(i, title=f'Habit {i}', is_recurring=True, recurrence_rule='daily')
+        for i in range(size.habits)
+    )
+    Subtask.objects.bulk_create(
+        Subtask(task=t, title=f'Step {k}', is_completed=k % 2 == 0, sort_order=k)
+        for t in open_tasks for k in range(size.subtasks_per_task)
+    )
+    HabitStreak.objects.bulk_create(
+        HabitStreak(
+            user=user, task=habit, streak_date=today - timedelta(days=d),
+            completed_today=True, current_streak=size.habit_days - d, longest_streak=size.habit_days,
+        )
+        for habit in habits for d in range(size.habit_days)
+    )
+    HabitState.objects.bulk_create(
+        HabitState(
+            user=user, task=habit, run_start=today - timedelta(days=size.habit_days - 1),
+            current_streak=size.habit_days, longest_streak=size.habit_days, last_completed=today,
+        )
+        for habit in habits
+    )
+    FocusSession.objects.bulk_create(
+        FocusSession(
+            user=user, task=open_tasks[i % len(open_tasks)],
+            started_at=now - timedelta(hours=5 * i), ended_at=now - timedelta(hours=5 * i) + timedelta(minutes=25),
+            duration_seconds=1500, is_completed=True,
+        )
+        for i in range(size.focus_sessions)
+    )
+    week_start = today - timedelta(days=today.weekday())
+    TimeBlock.objects.bulk_create(
+        TimeBlock(
+            user=user, task=open_tasks[i % len(open_tasks)], title=f'Block {i}',
+            block_date=week_start + timedelta(days=i % 7),
+            start_time=time(8 + i % 10), end_time=time(9 + i % 10), sort_order=i,
+        )
+        for i in range(size.blocks_this_week)
+    )
+    Notification.objects.bulk_create(
+        Notification(
+            user=user, type='reminder', title=f'Reminder {i}', message='Seeded notification.',
+            metadata={'task_id': str(open_tasks[i % len(open_tasks)].id)},
+        )
+        for i in range(size.notifications)
+    )
+    DailyCheckin.objects.bulk_create(
+        DailyCheckin(user=user, checkin_date=today - timedelta(days=d), reflection='Seeded reflection.')
+        for d in range(size.checkins)
+    )
+    conversations = Conversation.objects.bulk_create(
+        Conversation(user=user, title=f'Chat {i}') for i in range(size.conversations)
+    )
+    ChatMessage.objects.bulk_create(
+        ChatMessage(
+            conversation=conversation, role='user' if t % 2 == 0 else 'assistant',
+            content=f'Seeded chat turn {t} about planning the week.',
+        )
+        for conversation in conversations
+        for t in range(size.chat_turns)
+    )
+    rebuild_history(user_id=user.id)
+
+    return SimpleNamespace(
+        user=user,
+        goal=goals[0],
+        project=projects[0],
+        task=open_tasks[0],
+        subtask=Subtask.objects.filter(task=open_tasks[0]).first(),
+        habit=habits[0],
+        block=TimeBlock.objects.filter(user=user).first(),
+        session=FocusSession.objects.filter(user=user).first(),
+        notification=Notification.objects.filter(user=user).first(),
+        checkin=DailyCheckin.objects.filter(user=user).first(),
+        conversation=conversations[0],
+    )
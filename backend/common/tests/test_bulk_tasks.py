@@ -0,0 +1,94 @@
+"""
+Batch task create/update/delete.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.analytics.models import DailyUserStats
+from apps.sync.models import Tombstone
+from apps.tasks.models import Goal, Project, Subtask, Task
+
+
+class BulkTaskTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email='bulk@example.com', username='bulk', password='pass1234')
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass1234')
+        goal = Goal.objects.create(user=cls.user, title='Ship it')
+        cls.project = Project.objects.create(user=cls.user, goal=goal, title='Import')
+        foreign_goal = Goal.objects.create(user=cls.other, title='Not mine')
+        cls.foreign_project = Project.objects.create(user=cls.other, goal=foreign_goal, title='Not mine')
+        cls.tasks = [Task.objects.create(user=cls.user, title=f'Existing {i}') for i in range(3)]
+        Subtask.objects.create(task=cls.tasks[2], title='Goes with its task')
+        cls.foreign_task = Task.objects.create(user=cls.other, title='Not mine')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk(self, **body):
+        return self.client.post(reverse('tasks-bulk'), body, format='json')
+
+    def test_large_import_is_a_handful_of_queries(self):
+        rows = [{'title': f'Imported {i}', 'project': str(self.project.pk), 'priority': 'P2'} for i in range(300)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.bulk(create=rows)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.json()['created']), 300)
+        self.assertEqual(Task.objects.filter(user=self.user, project=self.project).count(), 300)
+        self.assertLessEqual(len(queries), 10)
+
+    def test_mixed_batch_updates_deletes_and_refreshes_side_effects(self):
+        done, renamed, removed = self.tasks
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.bulk(
+                create=[{'title': 'New'}],
+                update=[{'id': str(done.pk), 'status': 'done'}, {'id': str(renamed.pk), 'title': 'Renamed'}],
+                delete=[str(removed.pk)],
+            )
+
+        self.assertEqual(response.status_code, 201)
+        body = response.json()
+        self.assertEqual([t['title'] for t in body['updated']], ['Existing 0', 'Renamed'])
+        self.assertEqual(body['deleted'], [str(removed.pk)])
+
+        done.refresh_from_db()
+        self.assertIsNotNone(done.completed_at)
+        self.assertGreater(done.updated_at, done.created_at)
+        self.assertFalse(Task.objects.filter(pk=removed.pk).exists())
+        self.assertEqual(
+            list(Tombstone.objects.values_list('kind', 'object_id')), [('tasks', removed.pk)],
+        )
+        stats = DailyUserStats.objects.get(user=self.user, date=timezone.localdate())
+        self.assertEqual(stats.tasks_completed, 1)
+        self.assertEqual(stats.tasks_created, 3)
+
+    def test_any_invalid_item_rejects_the_whole_batch(self):
+        response = self.bulk(
+            create=[{'title': 'Fine'}, {'priority': 'P9'}, {'title': 'Theirs', 'project': str(self.foreign_project.pk)}],
+            update=[{'id': str(self.foreign_task.pk), 'title': 'Hijacked'}],
+            delete=[str(self.tasks[0].pk)],
+        )
+
+        self.assertEqual(response.status_code, 400)
+        errors = response.json()
+        self.assertEqual(errors['create'][0], {})
+        self.assertEqual(set(errors['create'][1]), {'title', 'priority'})
+        self.assertIn('project', errors['create'][2])
+        self.assertEqual(errors['update'], [{'id': ['Unknown task.']}])
+        self.assertNotIn('delete', errors)
+        self.assertEqual(Task.objects.filter(user=self.user).count(), 3)
+        self.foreign_task.refresh_from_db()
+        self.assertEqual(self.foreign_task.title, 'Not mine')
+
+    def test_batch_size_is_capped(self):
+        response = self.bulk(delete=[str(self.tasks[0].pk)] * 501)
+        self.assertEqual(response.status_code, 400)
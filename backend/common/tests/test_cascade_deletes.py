@@ -0,0 +1,81 @@
+"""
+Deletes that cascade over many rows coalesce their per-row side effects.
+"""
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.analytics import signals as analytics
+from apps.analytics.models import DailyUserStats
+from apps.sync.models import Tombstone
+from apps.tasks.models import Goal, Project, Task
+
+
+class CascadeDeleteTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='cascade@example.com', username='cascade', password='pass1234',
+        )
+        cls.goal = Goal.objects.create(user=cls.user, title='Launch')
+        cls.project = Project.objects.create(user=cls.user, goal=cls.goal, title='Website')
+        now = timezone.now()
+        with cls.captureOnCommitCallbacks(execute=True):
+            for i in range(100):
+                Task.objects.create(
+                    user=cls.user, project=cls.project, title=f'Done {i}', status='done', completed_at=now,
+                )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def completed(self):
+        return sum(DailyUserStats.objects.filter(user=self.user).values_list('tasks_completed', flat=True))
+
+    def test_project_delete_refreshes_the_rollup_once(self):
+        self.assertEqual(self.completed(), 100)
+        with mock.patch.object(analytics, 'refresh_moments', wraps=analytics.refresh_moments) as refresh:
+            with CaptureQueriesContext(connection) as queries, self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(reverse('projects-detail', args=[self.project.pk]))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(refresh.call_count, 1)
+        self.assertEqual(self.completed(), 0)
+        self.assertLessEqual(len(queries), 25)
+
+    def test_project_delete_writes_tombstones_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.delete(reverse('projects-detail', args=[self.project.pk]))
+
+        inserts = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('INSERT INTO "sync_tombstones"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(
+            sorted(Tombstone.objects.filter(user=self.user).values_list('kind', flat=True).distinct()),
+            ['projects', 'tasks'],
+        )
+        self.assertEqual(Tombstone.objects.filter(user=self.user, kind='tasks').count(), 100)
+
+    def test_goal_delete_refreshes_the_rollup_once(self):
+        with mock.patch.object(analytics, 'refresh_moments') as refresh:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.delete(reverse('goals-detail', args=[self.goal.pk]))
+
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(refresh.call_count, 1)
+
+    def test_account_delete_skips_rollup_and_cache_work(self):
+        with mock.patch.object(analytics, 'refresh_moments') as refresh, \
+                mock.patch.object(analytics, 'bump_user_version') as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.user.delete()
+
+        refresh.assert_not_called()
+        bump.assert_not_called()
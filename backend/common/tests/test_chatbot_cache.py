@@ -0,0 +1,101 @@
+"""
+Chatbot reply cache, exercised against a local stub of the Groq endpoint.
+"""
+import json
+import re
+from unittest import mock
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.chatbot import client
+from apps.chatbot.replies import reply_cache
+
+
+class StubGroq:
+    """Answers chat completions locally and records every request it sees."""
+
+    def __init__(self, reply='Break it into a five-minute first step.'):
+        self.reply = reply
+        self.requests = []
+
+    def __call__(self, request):
+        body = json.loads(request.content)
+        self.requests.append(body)
+        if body.get('stream'):
+            lines = [
+                f'data: {json.dumps({"choices": [{"delta": {"content": word}}]})}\n\n'
+                for word in re.findall(r'\S+\s*', self.reply)
+            ]
+            return httpx.Response(200, text=''.join(lines) + 'data: [DONE]\n\n')
+        return httpx.Response(200, json={'choices': [{'message': {'content': self.reply}}]})
+
+    def client(self):
+        return httpx.AsyncClient(transport=httpx.MockTransport(self))
+
+
+@override_settings(GROQ_API_KEY='test-key')
+class ChatReplyCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='chat@example.com', username='chat', password='pass1234',
+        )
+
+    def setUp(self):
+        reply_cache.clear()
+        self.groq = StubGroq()
+        patcher = mock.patch.object(client, 'get_client', self.groq.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    async def ask(self, message, **extra):
+        return await self.async_client.post(
+            '/api/chatbot/', {'message': message, **extra},
+            content_type='application/json', headers=self.auth,
+        )
+
+    async def test_identical_prompt_is_served_from_cache(self):
+        first = await self.ask('How do I stop procrastinating?')
+        second = await self.ask('  how do I   stop procrastinating?')
+
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(first.json()['reply'], second.json()['reply'])
+        self.assertEqual(len(self.groq.requests), 1)
+        self.assertEqual(reply_cache.hits, 1)
+
+    async def test_history_and_message_are_part_of_the_key(self):
+        first = await self.ask('How do I stop procrastinating?')
+        await self.ask('How do I stop procrastinating?', conversation_id=first.json()['conversation_id'])
+        await self.ask('How do I build a habit?')
+
+        self.assertEqual(len(self.groq.requests), 3)
+
+    async def test_streamed_reply_fills_the_cache(self):
+        response = await self.ask('Plan my morning', stream=True)
+        body = b''.join([chunk async for chunk in response.streaming_content]).decode()
+        self.assertIn('event: done', body)
+
+        cached = await self.ask('plan my morning')
+        self.assertEqual(cached['X-Cache'], 'HIT')
+        self.assertEqual(cached.json()['reply'], self.groq.reply)
+        self.assertEqual(len(self.groq.requests), 1)
+
+    async def test_upstream_errors_are_not_cached(self):
+        with mock.patch.object(
+            client, 'get_client',
+            lambda: httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(429, json={'error': {'message': 'Rate limited'}}),
+            )),
+        ):
+            failed = await self.ask('How do I focus?')
+        self.assertEqual(failed.status_code, 500)
+
+        retried = await self.ask('How do I focus?')
+        self.assertEqual(retried.status_code, 200)
+        self.assertEqual(retried['X-Cache'], 'MISS')
@@ -0,0 +1,162 @@
+"""
+Server-side chat conversations: token-budgeted history compaction, the
+rolling summary and the cached workload snapshot added to the prompt.
+"""
+from datetime import timedelta
+from unittest import mock
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.chatbot import client
+from apps.chatbot.context import build_snapshot
+from apps.chatbot.history import CHARS_PER_TOKEN, RECENT_TOKEN_BUDGET, estimate_tokens, split_recent
+from apps.chatbot.models import ChatMessage, Conversation
+from apps.chatbot.replies import reply_cache
+from apps.tasks.models import Task
+
+from .test_chatbot_cache import StubGroq
+
+
+def turns(count, chars=400):
+    return [
+        {'role': 'user' if i % 2 == 0 else 'assistant', 'content': f'Turn {i}. ' + 'x' * chars}
+        for i in range(count)
+    ]
+
+
+class SplitRecentTests(TestCase):
+
+    def test_recent_turns_fit_the_budget(self):
+        history = turns(40)
+        older, recent = split_recent(history)
+
+        self.assertEqual(older + recent, history)
+        self.assertLessEqual(sum(estimate_tokens(t['content']) for t in recent), RECENT_TOKEN_BUDGET)
+        self.assertTrue(older)
+
+    def test_oversized_newest_turn_is_truncated_not_dropped(self):
+        huge = [{'role': 'user', 'content': 'y' * (RECENT_TOKEN_BUDGET * CHARS_PER_TOKEN * 3)}]
+        older, recent = split_recent(huge)
+
+        self.assertEqual(older, [])
+        self.assertEqual(len(recent[0]['content']), RECENT_TOKEN_BUDGET * CHARS_PER_TOKEN)
+
+
+@override_settings(GROQ_API_KEY='test-key')
+class ConversationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='history@example.com', username='history', password='pass1234',
+        )
+        cls.conversation = Conversation.objects.create(user=cls.user, title='Long chat')
+        for turn in turns(30):
+            ChatMessage.objects.create(conversation=cls.conversation, **turn)
+        Task.objects.create(
+            user=cls.user, title='Ship the quarterly report', priority='P1',
+            due_date=timezone.now() + timedelta(hours=3),
+        )
+
+    def setUp(self):
+        cache.clear()
+        reply_cache.clear()
+        self.groq = StubGroq()
+        patcher = mock.patch.object(client, 'get_client', self.groq.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.auth = {'Authorization': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    async def ask(self, message='What next?', conversation_id=None):
+        body = {'message': message}
+        if conversation_id:
+            body['conversation_id'] = str(conversation_id)
+        return await self.async_client.post(
+            '/api/chatbot/', body, content_type='application/json', headers=self.auth,
+        )
+
+    async def test_older_turns_are_sent_as_a_summary(self):
+        response = await self.ask(conversation_id=self.conversation.pk)
+
+        sent = self.groq.requests[-1]['messages']
+        summary = next(m['content'] for m in sent if m['content'].startswith('Summary of the earlier'))
+        self.assertIn('User: Turn 0.', summary)
+        self.assertLess(len(sent), 22)
+        self.assertGreater(int(response['X-History-Bytes-Saved']), 0)
+
+    async def test_summary_rolls_forward_and_turns_are_stored(self):
+        await self.ask(conversation_id=self.conversation.pk)
+        first = await Conversation.objects.aget(pk=self.conversation.pk)
+        await self.ask('And after that?', conversation_id=self.conversation.pk)
+        second = await Conversation.objects.aget(pk=self.conversation.pk)
+
+        self.assertGreater(first.summarized_turns, 0)
+        self.assertGreaterEqual(second.summarized_turns, first.summarized_turns)
+        self.assertTrue(second.summary.startswith(first.summary))
+        self.assertEqual(await second.messages.acount(), 34)
+        last = await second.messages.order_by('-created_at').afirst()
+        self.assertEqual((last.role, last.content), ('assistant', self.groq.reply))
+
+    async def test_new_conversation_is_started_without_an_id(self):
+        response = await self.ask('Help me plan today')
+
+        conversation = await Conversation.objects.aget(pk=response.json()['conversation_id'])
+        self.assertEqual(conversation.title, 'Help me plan today')
+        self.assertEqual(await conversation.messages.acount(), 2)
+
+    async def test_failed_upstream_call_stores_nothing(self):
+        def failing():
+            return httpx.AsyncClient(transport=httpx.MockTransport(
+                lambda request: httpx.Response(503, json={'error': {'message': 'Over capacity'}}),
+            ))
+
+        with mock.patch.object(client, 'get_client', failing):
+            started = await self.ask('Help me plan today')
+            continued = await self.ask(conversation_id=self.conversation.pk)
+            streamed = await self.async_client.post(
+                '/api/chatbot/', {'message': 'What next?', 'conversation_id': str(self.conversation.pk), 'stream': True},
+                content_type='application/json', headers=self.auth,
+            )
+            body = b''.join([chunk async for chunk in streamed.streaming_content]).decode()
+
+        self.assertEqual((started.status_code, continued.status_code), (500, 500))
+        self.assertIn('event: error', body)
+        self.assertEqual(await Conversation.objects.filter(user=self.user).acount(), 1)
+        self.assertEqual(await self.conversation.messages.acount(), 30)
+        conversation = await Conversation.objects.aget(pk=self.conversation.pk)
+        self.assertEqual((conversation.summary, conversation.summarized_turns), ('', 0))
+
+        retried = await self.ask(conversation_id=self.conversation.pk)
+        self.assertEqual(retried.status_code, 200)
+        roles = [m.role async for m in self.conversation.messages.order_by('created_at')]
+        self.assertEqual(roles[-2:], ['user', 'assistant'])
+        self.assertEqual(len(roles), 32)
+
+    async def test_other_users_conversation_is_not_found(self):
+        other = await sync_to_async(get_user_model().objects.create_user)(
+            email='other@example.com', username='other', password='pass1234',
+        )
+        theirs = await Conversation.objects.acreate(user=other)
+
+        response = await self.ask(conversation_id=theirs.pk)
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.groq.requests, [])
+
+    async def test_workload_snapshot_is_in_the_prompt_and_cached(self):
+        await self.ask('What should I do first?')
+        sent = self.groq.requests[-1]['messages']
+        self.assertIn('Ship the quarterly report [P1]', sent[1]['content'])
+
+        with mock.patch('apps.chatbot.context.build_snapshot') as rebuilt:
+            await self.ask('And then?', conversation_id=self.conversation.pk)
+        rebuilt.assert_not_called()
+
+    def test_snapshot_query_count_is_fixed(self):
+        with self.assertNumQueries(4):
+            build_snapshot(self.user)
@@ -0,0 +1,76 @@
+"""
+ETag / If-None-Match support on list endpoints.
+"""
+from datetime import time
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.notifications.models import Notification
+from apps.schedule.models import TimeBlock
+from apps.tasks.models import Goal, Project, Subtask, Task
+
+
+class ConditionalListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='etag@example.com', username='etag', password='pass1234',
+        )
+        cls.goal = Goal.objects.create(user=cls.user, title='Ship v2')
+        cls.task = Task.objects.create(user=cls.user, title='Draft spec')
+        Subtask.objects.create(task=cls.task, title='Outline')
+        TimeBlock.objects.create(
+            user=cls.user, task=cls.task, title='Deep work', block_date=timezone.localdate(),
+            start_time=time(9), end_time=time(10),
+        )
+        Notification.objects.create(user=cls.user, title='Welcome')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def revalidate(self, url, params=None):
+        first = self.client.get(url, params)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Cache-Control'], 'private, no-cache')
+        again = self.client.get(url, params, HTTP_IF_NONE_MATCH=first['ETag'])
+        return first, again
+
+    def test_unchanged_lists_return_304(self):
+        for name in ('tasks-list', 'goals-list', 'weekly-schedule', 'notifications-list'):
+            with self.subTest(route=name):
+                first, again = self.revalidate(reverse(name))
+                self.assertEqual(again.status_code, 304)
+                self.assertEqual(again['ETag'], first['ETag'])
+                self.assertEqual(again.content, b'')
+
+    def test_query_params_are_part_of_the_etag(self):
+        url = reverse('tasks-list')
+        first = self.client.get(url)
+        filtered = self.client.get(url, {'status': 'done'}, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(filtered.status_code, 200)
+
+    def test_related_changes_invalidate(self):
+        cases = [
+            ('tasks-list', lambda: Subtask.objects.filter(task=self.task).update(
+                is_completed=True, updated_at=timezone.now(),
+            )),
+            ('tasks-list', lambda: Subtask.objects.filter(task=self.task).delete()),
+            ('goals-list', lambda: Project.objects.create(user=self.user, goal=self.goal, title='API')),
+            ('weekly-schedule', lambda: Task.objects.filter(pk=self.task.pk).update(
+                title='Final spec', updated_at=timezone.now(),
+            )),
+            ('notifications-list', lambda: self.client.post(reverse('mark-all-read'))),
+        ]
+        for name, change in cases:
+            with self.subTest(route=name):
+                first = self.client.get(reverse(name))
+                change()
+                again = self.client.get(reverse(name), HTTP_IF_NONE_MATCH=first['ETag'])
+                self.assertEqual(again.status_code, 200)
+                self.assertNotEqual(again['ETag'], first['ETag'])
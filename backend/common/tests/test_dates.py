@@ -0,0 +1,49 @@
+"""
+Day bucketing in the user's timezone.
+"""
+from datetime import date, datetime, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from apps.analytics.models import DailyUserStats
+from apps.focus.models import FocusSession
+from apps.tasks.models import Task
+from common.dates import day_bounds, get_zone, user_today
+
+# 2026-03-10 11:30 UTC is already 2026-03-11 in Auckland (UTC+13) and
+# still 2026-03-10 in Los Angeles (UTC-7).
+MOMENT = datetime(2026, 3, 10, 11, 30, tzinfo=dt_timezone.utc)
+
+
+class DayBucketingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='tz@example.com', username='tz', password='pass1234', timezone='Pacific/Auckland',
+        )
+
+    def test_today_and_bounds_follow_the_user_zone(self):
+        self.assertEqual(user_today(self.user, MOMENT), date(2026, 3, 11))
+        lower, upper = day_bounds(date(2026, 3, 11), date(2026, 3, 11), get_zone('Pacific/Auckland'))
+        self.assertEqual(lower, datetime(2026, 3, 10, 11, 0, tzinfo=dt_timezone.utc))
+        self.assertEqual(upper, datetime(2026, 3, 11, 11, 0, tzinfo=dt_timezone.utc))
+
+    def test_unknown_zone_falls_back_to_utc(self):
+        self.assertEqual(get_zone('Mars/Olympus_Mons'), dt_timezone.utc)
+
+    def test_rollup_uses_local_days_and_rebuilds_when_the_timezone_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            task = Task.objects.create(user=self.user, title='Ship', status='done', completed_at=MOMENT)
+            Task.objects.filter(pk=task.pk).update(created_at=MOMENT)
+            FocusSession.objects.create(
+                user=self.user, started_at=MOMENT, duration_seconds=1500, is_completed=True,
+            )
+        completed = DailyUserStats.objects.filter(user=self.user, tasks_completed__gt=0)
+        self.assertEqual(list(completed.values_list('date', 'focus_sessions')), [(date(2026, 3, 11), 1)])
+
+        self.user.timezone = 'America/Los_Angeles'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.save()
+        self.assertEqual(list(completed.values_list('date', 'focus_sessions')), [(date(2026, 3, 10), 1)])
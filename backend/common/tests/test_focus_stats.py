@@ -0,0 +1,61 @@
+"""
+Focus stats and heatmap from the daily rollup.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.analytics.models import DailyUserStats
+from apps.focus.stats import FocusDays
+
+
+class FocusStatsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='focus@example.com', username='focus', password='pass1234',
+        )
+        cls.today = timezone.now().date()
+        # A 4-day run ending 10 days ago, and a 3-day run ending today.
+        for offset in (0, 1, 2, 10, 11, 12, 13, 400):
+            DailyUserStats.objects.create(
+                user=cls.user, date=cls.today - timedelta(days=offset), focus_sessions=2, focus_seconds=3000,
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_streaks_come_from_the_day_bitmap(self):
+        days = FocusDays({self.today - timedelta(days=n): (1, 60) for n in (1, 2, 5, 6, 7)})
+        bits = days.bitmap(self.today)
+        self.assertEqual(days.current_streak(bits), 0)
+        self.assertEqual(days.longest_streak(bits), 3)
+        self.assertEqual(days.current_streak(days.bitmap(self.today - timedelta(days=1))), 2)
+
+    def test_stats_totals_and_streaks(self):
+        with self.assertNumQueries(1):
+            stats = self.client.get(reverse('focus-stats')).json()
+
+        self.assertEqual(stats['today'], {'sessions': 2, 'total_minutes': 50})
+        self.assertEqual(stats['this_week'], {'sessions': 6, 'total_minutes': 150})
+        self.assertEqual(stats['all_time'], {'sessions': 16, 'total_minutes': 400})
+        self.assertEqual((stats['current_streak_days'], stats['longest_streak_days']), (3, 4))
+
+    def test_heatmap_covers_the_last_365_days(self):
+        heatmap = self.client.get(reverse('focus-heatmap')).json()
+
+        self.assertEqual(heatmap['end'], self.today.isoformat())
+        self.assertEqual(heatmap['start'], (self.today - timedelta(days=364)).isoformat())
+        self.assertEqual(len(heatmap['sessions']), 365)
+        self.assertEqual(sum(heatmap['sessions']), 14)
+        self.assertEqual(heatmap['minutes'][-1], 50)
+        self.assertEqual(heatmap['minutes'][-11], 50)
+        self.assertEqual(heatmap['minutes'][-4], 0)
@@ -0,0 +1,103 @@
+"""
+Habit progress and check-ins.
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.habits.models import HabitState, HabitStreak
+from apps.tasks.models import Task
+
+
+class HabitProgressTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='habits@example.com', username='habits', password='pass1234',
+        )
+        cls.reading = Task.objects.create(user=cls.user, title='Read', is_recurring=True, sort_order=1)
+        cls.running = Task.objects.create(user=cls.user, title='Run', is_recurring=True, sort_order=2)
+        today = timezone.now().date()
+        for offset, current in ((40, 9), (2, 1), (1, 2), (0, 3)):
+            HabitStreak.objects.create(
+                user=cls.user, task=cls.reading, streak_date=today - timedelta(days=offset),
+                completed_today=True, current_streak=current, longest_streak=9,
+            )
+        HabitStreak.objects.create(
+            user=cls.user, task=cls.reading, streak_date=today - timedelta(days=3), completed_today=False,
+        )
+        HabitState.objects.create(
+            user=cls.user, task=cls.reading, run_start=today - timedelta(days=2),
+            current_streak=3, longest_streak=9, last_completed=today,
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_progress_counts_the_last_30_days_and_reports_the_latest_streak(self):
+        with self.assertNumQueries(1):
+            progress = self.client.get(reverse('habit-progress')).json()
+
+        self.assertEqual([p['title'] for p in progress], ['Read', 'Run'])
+        reading, running = progress
+        self.assertEqual(reading['completed_days'], 3)
+        self.assertEqual(reading['completion_rate'], 10.0)
+        self.assertEqual((reading['current_streak'], reading['longest_streak']), (3, 9))
+        self.assertEqual(
+            (running['completed_days'], running['current_streak'], running['longest_streak']), (0, 0, 0),
+        )
+
+    def test_a_missed_day_breaks_the_reported_streak(self):
+        HabitState.objects.filter(task=self.reading).update(last_completed=timezone.now().date() - timedelta(days=2))
+        reading = self.client.get(reverse('habit-progress')).json()[0]
+        self.assertEqual((reading['current_streak'], reading['longest_streak']), (0, 9))
+
+
+class HabitCheckinTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='checkin@example.com', username='checkin', password='pass1234',
+        )
+        cls.habit = Task.objects.create(user=cls.user, title='Stretch', is_recurring=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_state_carries_runs_and_the_longest_streak_across_gaps(self):
+        state = HabitState(user=self.user, task=self.habit)
+        start = timezone.now().date()
+        for offset in (0, 1, 2, 5, 6):
+            self.assertTrue(state.complete(start + timedelta(days=offset)))
+        self.assertFalse(state.complete(start + timedelta(days=6)))
+
+        self.assertEqual((state.current_streak, state.longest_streak), (2, 3))
+        self.assertEqual(state.run_start, start + timedelta(days=5))
+        self.assertEqual(state.streak_on(start + timedelta(days=7)), 2)
+        self.assertEqual(state.streak_on(start + timedelta(days=8)), 0)
+
+    def test_checkin_updates_the_state_row_and_logs_the_day_once(self):
+        url = reverse('habit-checkin', kwargs={'task_id': self.habit.pk})
+        HabitState.objects.create(
+            user=self.user, task=self.habit, current_streak=4, longest_streak=4,
+            last_completed=timezone.now().date() - timedelta(days=1),
+        )
+
+        first = self.client.post(url).json()
+        second = self.client.post(url).json()
+
+        self.assertEqual((first['current_streak'], first['longest_streak']), (5, 5))
+        self.assertEqual(second['id'], first['id'])
+        state = HabitState.objects.get(task=self.habit)
+        self.assertEqual((state.current_streak, state.last_completed), (5, timezone.now().date()))
+        self.assertEqual(HabitStreak.objects.filter(task=self.habit).count(), 1)
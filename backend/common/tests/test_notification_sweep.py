@@ -0,0 +1,150 @@
+"""
+Set-based overdue and reminder sweeps: dedupe across runs, the watermark
+that limits later runs to tasks that changed, and the sharded fan-out.
+"""
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from apps.notifications import tasks as sweeps
+from apps.notifications.models import Notification, SweepWatermark
+from apps.notifications.tasks import (
+    UUID_SPACE, _sweep_candidates, create_alerts, dispatch_sweep, shard_bounds, sweep_shard,
+)
+from apps.tasks.models import Task
+from config.celery import app
+
+
+class SweepTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='sweep@example.com', username='sweep', password='pass1234',
+        )
+
+    def setUp(self):
+        self.now = timezone.now()
+
+    def task(self, due_in, edited_ago=timedelta(hours=2), **fields):
+        task = Task.objects.create(user=self.user, title='Task', due_date=self.now + due_in, **fields)
+        Task.objects.filter(pk=task.pk).update(updated_at=self.now - edited_ago)
+        return task
+
+    def candidates(self, kind, since):
+        return {row[0] for row in _sweep_candidates(kind, self.now, since)}
+
+    def test_second_run_creates_no_duplicates(self):
+        self.task(timedelta(hours=-1))
+        self.task(timedelta(hours=3))
+        self.task(timedelta(hours=-1), status='done')
+
+        for kind in ('overdue', 'reminder'):
+            self.assertEqual(sweep_shard(kind, 0, 1, self.now.isoformat()), 1)
+            self.assertEqual(sweep_shard(kind, 0, 1, self.now.isoformat()), 0)
+        self.assertEqual(Notification.objects.filter(user=self.user).count(), 2)
+
+    def test_alerts_lost_to_a_concurrent_sweep_are_not_pushed(self):
+        raced, won = self.task(timedelta(hours=-1)), self.task(timedelta(hours=-2))
+        build = sweeps._build_alert
+
+        def racing_build(kind, task_id, *row):
+            # Another sweep inserts this task's alert after our anti-join ran.
+            if task_id == raced.pk:
+                Notification.objects.bulk_create([build(kind, task_id, *row)])
+            return build(kind, task_id, *row)
+
+        rows = list(_sweep_candidates('overdue', self.now, None))
+        with mock.patch.object(sweeps, '_build_alert', racing_build), \
+                mock.patch('apps.notifications.push.publish') as publish:
+            created = create_alerts('overdue', rows)
+
+        self.assertEqual([alert.metadata['task_id'] for alert in created], [str(won.pk)])
+        pushed = publish.call_args.args[0]
+        self.assertEqual([alert.metadata['task_id'] for alert in pushed], [str(won.pk)])
+        self.assertEqual(Notification.objects.filter(type='overdue').count(), 2)
+
+    def test_watermark_skips_unchanged_reminders(self):
+        since = self.now - timedelta(hours=1)
+        unchanged = self.task(timedelta(hours=10))
+        crossed = self.task(timedelta(hours=23, minutes=30))
+        moved = self.task(timedelta(days=3))
+        moved.due_date = self.now + timedelta(hours=10)
+        moved.save()
+
+        self.assertEqual(self.candidates('reminder', since), {crossed.pk, moved.pk})
+        self.assertEqual(self.candidates('reminder', None), {unchanged.pk, crossed.pk, moved.pk})
+
+    def test_watermark_skips_unchanged_overdue_tasks(self):
+        since = self.now - timedelta(hours=1)
+        self.task(timedelta(hours=-3))
+        crossed = self.task(timedelta(minutes=-30))
+        reopened = self.task(timedelta(hours=-5), status='done')
+        reopened.status = 'todo'
+        reopened.save()
+
+        self.assertEqual(self.candidates('overdue', since), {crossed.pk, reopened.pk})
+
+
+class ShardTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            get_user_model().objects.create_user(
+                email=f'shard{i}@example.com', username=f'shard{i}', password='pass1234',
+            )
+            for i in range(12)
+        ]
+        due = timezone.now() - timedelta(hours=1)
+        Task.objects.bulk_create(Task(user=user, title='Late', due_date=due) for user in cls.users)
+
+    def setUp(self):
+        # Run the chord in-process: shards in order, then the callback.
+        self.addCleanup(setattr, app.conf, 'task_always_eager', app.conf.task_always_eager)
+        app.conf.task_always_eager = True
+
+    def owners(self, user_id, shards):
+        owners = []
+        for shard in range(shards):
+            lower, upper = shard_bounds(shard, shards)
+            if lower <= user_id and (upper is None or user_id < upper):
+                owners.append(shard)
+        return owners
+
+    def test_shards_partition_the_uuid_space(self):
+        edges = [uuid.UUID(int=0), uuid.UUID(int=UUID_SPACE - 1)]
+        for shards in (1, 3, 8, 16):
+            bounds = [shard_bounds(shard, shards) for shard in range(shards)]
+            self.assertEqual(bounds[0][0], uuid.UUID(int=0))
+            self.assertIsNone(bounds[-1][1])
+            self.assertEqual([upper for _, upper in bounds[:-1]], [lower for lower, _ in bounds[1:]])
+            for user_id in edges + [lower for lower, _ in bounds] + [uuid.uuid4() for _ in range(50)]:
+                self.assertEqual(len(self.owners(user_id, shards)), 1, (shards, user_id))
+
+    def test_every_user_is_swept_by_exactly_one_shard(self):
+        now = timezone.now().isoformat()
+        created = [sweep_shard('overdue', shard, 4, now) for shard in range(4)]
+
+        self.assertEqual(sum(created), len(self.users))
+        self.assertEqual(Notification.objects.filter(type='overdue').count(), len(self.users))
+
+    @override_settings(NOTIFICATION_SWEEP_SHARDS=3)
+    def test_failed_shard_does_not_advance_the_watermark(self):
+        def failing_bounds(shard, shards):
+            if shard == 1:
+                raise RuntimeError('worker lost')
+            return shard_bounds(shard, shards)
+
+        with mock.patch.object(sweeps, 'shard_bounds', failing_bounds):
+            with self.assertRaises(RuntimeError):
+                dispatch_sweep('overdue')
+        self.assertIsNone(SweepWatermark.objects.get(name='overdue').watermark)
+
+        missed = len(self.users) - Notification.objects.count()
+        self.assertEqual(dispatch_sweep('overdue').get(), missed)
+        self.assertIsNotNone(SweepWatermark.objects.get(name='overdue').watermark)
@@ -0,0 +1,101 @@
+"""
+Drag-and-drop ordering: the one-statement bulk reorder and gap-based moves.
+"""
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.tasks.models import Task
+from common.ordering import ORDER_GAP, RENUMBER_RADIUS
+
+
+class OrderingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email='order@example.com', username='order', password='pass1234')
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass1234')
+        cls.tasks = [Task.objects.create(user=cls.user, title=f'Task {i}', sort_order=i) for i in range(5)]
+        cls.foreign = Task.objects.create(user=cls.other, title='Not yours', sort_order=7)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def orders(self):
+        return dict(Task.objects.values_list('id', 'sort_order'))
+
+    def reorder(self, items):
+        return self.client.patch(reverse('tasks-reorder'), {'items': items}, format='json')
+
+    def move(self, task, **neighbours):
+        body = {key: str(value.pk) for key, value in neighbours.items()}
+        return self.client.post(reverse('tasks-move', args=[task.pk]), body, format='json')
+
+    def test_bulk_reorder_is_one_update_statement(self):
+        items = [{'id': str(task.pk), 'sort_order': 100 - i} for i, task in enumerate(self.tasks)]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.reorder(items)
+
+        self.assertEqual(response.status_code, 200)
+        updates = [q['sql'] for q in queries.captured_queries if q['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('CASE', updates[0])
+        orders = self.orders()
+        self.assertEqual([orders[task.pk] for task in self.tasks], [100, 99, 98, 97, 96])
+
+    def test_ids_the_user_does_not_own_reject_the_whole_request(self):
+        before = self.orders()
+        response = self.reorder([
+            {'id': str(self.tasks[0].pk), 'sort_order': 50},
+            {'id': str(self.foreign.pk), 'sort_order': 0},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn(str(self.foreign.pk), response.json()['items'][0])
+        self.assertEqual(self.orders(), before)
+
+    def test_move_writes_only_the_moved_row_while_the_gap_lasts(self):
+        first, second = self.tasks[0], self.tasks[1]
+        Task.objects.filter(pk=second.pk).update(sort_order=ORDER_GAP)
+
+        response = self.move(self.tasks[4], after=first, before=second)
+        self.assertEqual(response.json()['items'], [{'id': str(self.tasks[4].pk), 'sort_order': ORDER_GAP // 2}])
+
+    def test_move_renumbers_a_short_list_when_the_gap_runs_out(self):
+        first, second, moved = self.tasks[0], self.tasks[1], self.tasks[4]
+
+        response = self.move(moved, after=first, before=second)
+        items = response.json()['items']
+
+        self.assertEqual(response.status_code, 200)
+        expected = [first, moved, second, self.tasks[2], self.tasks[3]]
+        self.assertEqual([item['id'] for item in items], [str(task.pk) for task in expected])
+        self.assertEqual([item['sort_order'] for item in items], [(i + 1) * ORDER_GAP for i in range(5)])
+        orders = self.orders()
+        self.assertEqual([orders[task.pk] for task in expected], [(i + 1) * ORDER_GAP for i in range(5)])
+        self.assertEqual(orders[self.foreign.pk], 7)
+
+    def test_renumber_rewrites_only_the_slice_around_the_drop_point(self):
+        Task.objects.filter(user=self.user).delete()
+        # Evenly spaced, except a run of ten packed into consecutive values.
+        orders = [i * ORDER_GAP for i in range(40)] + [40 * ORDER_GAP + k for k in range(10)]
+        orders += [i * ORDER_GAP for i in range(50, 100)]
+        tasks = Task.objects.bulk_create(
+            Task(user=self.user, title=f'Task {i}', sort_order=order) for i, order in enumerate(orders)
+        )
+        moved = tasks[99]
+
+        response = self.move(moved, after=tasks[44], before=tasks[45])
+        items = response.json()['items']
+
+        self.assertEqual(len(items), 2 * RENUMBER_RADIUS + 1)
+        self.assertEqual(items[RENUMBER_RADIUS]['id'], str(moved.pk))
+        expected = tasks[:45] + [moved] + tasks[45:99]
+        ordered = list(Task.objects.filter(user=self.user).order_by('sort_order').values_list('id', 'sort_order'))
+        self.assertEqual([pk for pk, _ in ordered], [task.pk for task in expected])
+        self.assertEqual(len({order for _, order in ordered}), 100)
@@ -0,0 +1,69 @@
+"""
+Keyset pagination on the large list endpoints.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.notifications.models import Notification
+from apps.tasks.models import Task
+
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='pages@example.com', username='pages', password='pass1234',
+        )
+        # Most tasks share sort_order 0, like freshly created ones do.
+        Task.objects.bulk_create(
+            Task(user=cls.user, title=f'Task {i}', sort_order=0 if i % 5 else i) for i in range(45)
+        )
+        Notification.objects.bulk_create(
+            Notification(user=cls.user, title=f'Note {i}') for i in range(25)
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, params):
+        seen, pages = [], 0
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertNotIn('count', body)
+            seen += [row['id'] for row in body['results']]
+            pages += 1
+            if not body['next']:
+                return seen, pages
+            response = self.client.get(body['next'])
+
+    def test_pages_cover_every_task_once_in_list_order(self):
+        seen, pages = self.walk(reverse('tasks-list'), {'page_size': 10})
+
+        expected = Task.objects.filter(user=self.user).order_by('sort_order', '-created_at', '-pk')
+        self.assertEqual(seen, [str(pk) for pk in expected.values_list('pk', flat=True)])
+        self.assertEqual(pages, 5)
+
+    def test_notifications_are_newest_first(self):
+        seen, _ = self.walk(reverse('notifications-list'), {'page_size': 7})
+
+        expected = Notification.objects.filter(user=self.user).order_by('-created_at', '-pk')
+        self.assertEqual(seen, [str(pk) for pk in expected.values_list('pk', flat=True)])
+
+    def test_page_param_keeps_counted_page_numbers(self):
+        body = self.client.get(reverse('tasks-list'), {'page': 2, 'page_size': 20}).json()
+        self.assertEqual(body['count'], 45)
+        self.assertEqual(len(body['results']), 20)
+
+    def test_ordering_param_falls_back_to_page_numbers(self):
+        body = self.client.get(reverse('tasks-list'), {'ordering': 'due_date'}).json()
+        self.assertEqual(body['count'], 45)
+
+    def test_tampered_cursor_is_rejected(self):
+        response = self.client.get(reverse('tasks-list'), {'cursor': 'bm90LWEtY3Vyc29y'})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,138 @@
+"""
+Query-count and response-size budgets for every GET route under /api/.
+
+Two users are seeded — one small, one with thousands of rows — and each
+route is requested as both. A route fails if it issues more queries than its
+budget, if its query count differs between the two users (i.e. it grows with
+the number of rows), or if the large user's response exceeds its size budget.
+Adding a GET route without a budget entry also fails, so new endpoints have
+to declare one.
+"""
+from dataclasses import dataclass, field
+from typing import Callable
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLResolver, get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.sync.views import format_cursor
+
+from .seed import LARGE, SMALL, seed_user
+
+
+@dataclass(frozen=True)
+class Budget:
+    queries: int
+    kb: int
+    kwargs: Callable = None
+    params: dict | Callable = field(default_factory=dict)
+
+
+BUDGETS = {
+    'me': Budget(queries=1, kb=1),
+    'goals-list': Budget(queries=4, kb=4),
+    'goals-detail': Budget(queries=4, kb=8, kwargs=lambda s: {'pk': s.goal.pk}),
+    'projects-list': Budget(queries=3, kb=8),
+    'projects-detail': Budget(queries=3, kb=1, kwargs=lambda s: {'pk': s.project.pk}),
+    'tasks-list': Budget(queries=3, kb=48, params={'page_size': 100}),
+    'tasks-detail': Budget(queries=4, kb=2, kwargs=lambda s: {'pk': s.task.pk}),
+    'subtasks-list': Budget(queries=3, kb=8),
+    'search': Budget(queries=5, kb=4, params={'q': 'task'}),
+    'subtasks-detail': Budget(queries=2, kb=1, kwargs=lambda s: {'pk': s.subtask.pk}),
+    'time-blocks-list': Budget(queries=3, kb=12),
+    'time-blocks-detail': Budget(queries=3, kb=1, kwargs=lambda s: {'pk': s.block.pk}),
+    'weekly-schedule': Budget(queries=3, kb=24),
+    'risk-detection': Budget(queries=3, kb=128),
+    'focus-sessions-list': Budget(queries=2, kb=12),
+    'focus-sessions-detail': Budget(queries=3, kb=1, kwargs=lambda s: {'pk': s.session.pk}),
+    'focus-stats': Budget(queries=2, kb=1),
+    'focus-heatmap': Budget(queries=2, kb=4),
+    'daily-checkins-list': Budget(queries=2, kb=8),
+    'daily-checkins-detail': Budget(queries=2, kb=1, kwargs=lambda s: {'pk': s.checkin.pk}),
+    'habit-list': Budget(queries=2, kb=12),
+    'habit-streaks': Budget(queries=2, kb=12, kwargs=lambda s: {'task_id': s.habit.pk}),
+    'habit-progress': Budget(queries=2, kb=8),
+    'analytics-overview': Budget(queries=3, kb=1),
+    'analytics-trends': Budget(queries=2, kb=8, params={'days': 365, 'granularity': 'week'}),
+    'analytics-burndown': Budget(queries=3, kb=4),
+    'analytics-time-allocation': Budget(queries=4, kb=4),
+    'chat-conversations-list': Budget(queries=3, kb=4),
+    'chat-conversations-detail': Budget(queries=3, kb=16, kwargs=lambda s: {'pk': s.conversation.pk}),
+    # Delta path: nothing has changed since the cursor.
+    'sync': Budget(queries=11, kb=1, params=lambda: {'since': format_cursor(timezone.now())}),
+    'notifications-list': Budget(queries=3, kb=8),
+    'notifications-detail': Budget(queries=2, kb=1, kwargs=lambda s: {'pk': s.notification.pk}),
+}
+
+# Routes with a known per-row query pattern that is scheduled to be fixed.
+# They are reported as skipped rather than silently dropped from BUDGETS.
+KNOWN_N_PLUS_ONE = {}
+
+
+def iter_routes(patterns, prefix=''):
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_routes(pattern.url_patterns, prefix + str(pattern.pattern))
+        else:
+            yield prefix + str(pattern.pattern), pattern
+
+
+def api_get_routes():
+    """Names of every GET route mounted under /api/ (format-suffix and API-root views excluded)."""
+    names = set()
+    for route, pattern in iter_routes(get_resolver().url_patterns):
+        if not route.startswith('api/') or '(?P<format>' in route or pattern.name == 'api-root':
+            continue
+        callback = pattern.callback
+        actions = getattr(callback, 'actions', None)
+        view_class = getattr(callback, 'cls', None) or getattr(callback, 'view_class', None)
+        if actions is not None:
+            if 'get' in actions:
+                names.add(pattern.name)
+        elif view_class is not None and hasattr(view_class, 'get'):
+            names.add(pattern.name)
+    return names
+
+
+class QueryBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.small = seed_user('small@example.com', SMALL)
+        cls.large = seed_user('large@example.com', LARGE)
+
+    def request(self, seed, name, budget):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(seed.user)}')
+        url = reverse(name, kwargs=budget.kwargs(seed) if budget.kwargs else None)
+        cache.clear()  # budgets are for the uncached path
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url, budget.params() if callable(budget.params) else budget.params)
+        self.assertEqual(response.status_code, 200, f'{name}: {response.status_code} {url}')
+        return len(queries), len(response.content)
+
+    def test_every_get_route_has_a_budget(self):
+        missing = api_get_routes() - set(BUDGETS)
+        self.assertFalse(missing, f'GET routes without a query budget: {sorted(missing)}')
+
+    def test_query_counts_are_within_budget_and_independent_of_row_count(self):
+        for name, budget in BUDGETS.items():
+            with self.subTest(route=name):
+                if name in KNOWN_N_PLUS_ONE:
+                    self.skipTest(f'{name}: {KNOWN_N_PLUS_ONE[name]}')
+                small_queries, _ = self.request(self.small, name, budget)
+                large_queries, large_bytes = self.request(self.large, name, budget)
+                self.assertEqual(
+                    small_queries, large_queries,
+                    f'{name}: query count grows with rows ({small_queries} -> {large_queries})',
+                )
+                self.assertLessEqual(large_queries, budget.queries, f'{name}: over query budget')
+                self.assertLessEqual(
+                    large_bytes, budget.kb * 1024,
+                    f'{name}: response is {large_bytes} bytes, budget {budget.kb} KB',
+                )
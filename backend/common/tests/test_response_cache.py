@@ -0,0 +1,73 @@
+"""
+Per-user versioned caching of dashboard responses.
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.focus.models import FocusSession
+from apps.tasks.models import Task
+from common.cache import get_user_version
+
+
+class UserResponseCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email='cache@example.com', username='cache', password='pass1234')
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass1234')
+        cls.task = Task.objects.create(user=cls.user, title='Write report')
+
+    def setUp(self):
+        cache.clear()
+
+    def get(self, name, user=None):
+        client = APIClient()
+        client.force_authenticate(user or self.user)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return response.json(), len(queries)
+
+    def test_repeat_requests_skip_the_database(self):
+        for name in ('analytics-overview', 'analytics-time-allocation', 'focus-stats', 'habit-progress'):
+            with self.subTest(route=name):
+                first, cold = self.get(name)
+                second, warm = self.get(name)
+                self.assertEqual(first, second)
+                self.assertGreater(cold, 0)
+                self.assertEqual(warm, 0)
+
+    def test_task_change_invalidates_after_the_rollup_refresh(self):
+        before, _ = self.get('analytics-overview')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.task.status = 'done'
+            self.task.completed_at = timezone.now()
+            self.task.save()
+
+        after, queries = self.get('analytics-overview')
+        self.assertGreater(queries, 0)
+        self.assertEqual(after['completed'], before['completed'] + 1)
+        self.assertEqual(after['today_completed'], before['today_completed'] + 1)
+
+    def test_focus_session_invalidates_only_its_owner(self):
+        self.get('focus-stats')
+        self.get('focus-stats', user=self.other)
+        mine, theirs = get_user_version(self.user.pk), get_user_version(self.other.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FocusSession.objects.create(
+                user=self.user, started_at=timezone.now(), duration_seconds=1500, is_completed=True,
+            )
+
+        self.assertNotEqual(get_user_version(self.user.pk), mine)
+        self.assertEqual(get_user_version(self.other.pk), theirs)
+        stats, _ = self.get('focus-stats')
+        self.assertEqual(stats['today']['total_minutes'], 25)
@@ -0,0 +1,69 @@
+"""
+Full-text search across tasks, goals and projects.
+"""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from apps.tasks.models import Goal, Project, Task
+
+
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email='search@example.com', username='search', password='pass1234')
+        other = User.objects.create_user(email='other@example.com', username='other', password='pass1234')
+        cls.goal = Goal.objects.create(user=cls.user, title='Run a marathon', description='Train for the spring race')
+        cls.project = Project.objects.create(user=cls.user, goal=cls.goal, title='Training plan')
+        cls.task = Task.objects.create(user=cls.user, title='Buy running shoes', description='Before training starts')
+        Task.objects.create(user=cls.user, title='Write report', description='Quarterly numbers')
+        Task.objects.create(user=other, title='Training log', description='Not mine')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, q, **params):
+        response = self.client.get(reverse('search'), {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_ranks_title_matches_above_description_matches(self):
+        results = self.search('training')
+
+        self.assertEqual((results[0]['type'], results[0]['id']), ('project', str(self.project.pk)))
+        self.assertEqual({r['title'] for r in results[1:]}, {'Run a marathon', 'Buy running shoes'})
+
+    def test_stems_and_matches_prefixes(self):
+        self.assertEqual({r['title'] for r in self.search('runs')}, {'Buy running shoes', 'Run a marathon'})
+        self.assertEqual([r['title'] for r in self.search('quarter')], ['Write report'])
+
+    def test_query_syntax_is_not_interpreted(self):
+        self.assertEqual(self.search('"report OR (NEAR'), [])
+        self.assertEqual(self.search('   '), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.task.title = 'Buy trail shoes'
+        self.task.description = ''
+        self.task.save()
+        self.assertEqual([r['title'] for r in self.search('trail')], ['Buy trail shoes'])
+        self.assertNotIn('task', [r['type'] for r in self.search('running')])
+
+        self.task.delete()
+        self.assertEqual(self.search('trail'), [])
+
+    def test_list_search_param_uses_the_index(self):
+        response = self.client.get(reverse('tasks-list'), {'search': 'shoe'})
+        self.assertEqual([t['title'] for t in response.json()['results']], ['Buy running shoes'])
+
+    def test_list_search_param_honours_search_fields(self):
+        # Projects search titles only; tasks search titles and descriptions.
+        Project.objects.create(user=self.user, goal=self.goal, title='Race day', description='Pack the shoes')
+        projects = self.client.get(reverse('projects-list'), {'search': 'shoe'}).json()
+        tasks = self.client.get(reverse('tasks-list'), {'search': 'starts'}).json()
+
+        self.assertEqual(projects['results'], [])
+        self.assertEqual([t['title'] for t in tasks['results']], ['Buy running shoes'])
@@ -0,0 +1,98 @@
+"""
+Delta sync: changed rows and tombstones since a cursor.
+"""
+from datetime import time, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.schedule.models import TimeBlock
+from apps.sync.models import Tombstone
+from apps.sync.tasks import purge_tombstones
+from apps.sync.views import format_cursor
+from apps.tasks.models import Subtask, Task
+
+
+class SyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.user = User.objects.create_user(email='sync@example.com', username='sync', password='pass1234')
+        cls.other = User.objects.create_user(email='other@example.com', username='other', password='pass1234')
+        cls.task = Task.objects.create(user=cls.user, title='Plan sprint')
+        cls.subtask = Subtask.objects.create(task=cls.task, title='List stories')
+        cls.block = TimeBlock.objects.create(
+            user=cls.user, task=cls.task, title='Planning', block_date=timezone.localdate(),
+            start_time=time(9), end_time=time(10),
+        )
+        Task.objects.create(user=cls.other, title='Not mine')
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None):
+        params = {'since': format_cursor(since)} if since else {}
+        response = self.client.get(reverse('sync'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_first_sync_is_a_full_snapshot_of_own_rows(self):
+        data = self.sync()
+
+        self.assertTrue(data['full'])
+        self.assertEqual([t['title'] for t in data['changes']['tasks']], ['Plan sprint'])
+        self.assertEqual(data['changes']['subtasks'][0]['task'], str(self.task.pk))
+        self.assertEqual(data['changes']['time_blocks'][0]['start_time'], '09:00:00')
+        self.assertNotIn('user', data['changes']['tasks'][0])
+
+    def test_delta_contains_only_changed_rows(self):
+        since = timezone.now()
+        self.task.title = 'Plan sprint 12'
+        self.task.save()
+
+        data = self.sync(since)
+        self.assertFalse(data['full'])
+        self.assertEqual(list(data['changes']), ['tasks'])
+        self.assertEqual(data['changes']['tasks'][0]['title'], 'Plan sprint 12')
+        self.assertEqual(data['deleted'], {})
+
+    def test_deletions_are_tombstoned(self):
+        since = timezone.now()
+        extra = Subtask.objects.create(task=self.task, title='Estimate')
+        extra_id, task_id = str(extra.pk), str(self.task.pk)
+        extra.delete()
+        self.assertEqual(self.sync(since)['deleted'], {'subtasks': [extra_id]})
+
+        self.task.delete()
+        deleted = self.sync(since)['deleted']
+        # Subtasks removed with their task are implied by the task's tombstone.
+        self.assertEqual(deleted['tasks'], [task_id])
+        self.assertEqual(deleted['subtasks'], [extra_id])
+
+    def test_account_deletion_leaves_no_tombstones(self):
+        self.other.delete()
+        self.assertFalse(Tombstone.objects.exists())
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_cursor_older_than_retention_gets_full_snapshot(self):
+        data = self.sync(timezone.now() - timedelta(days=31))
+        self.assertTrue(data['full'])
+        self.assertIn('tasks', data['changes'])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get(reverse('sync'), {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+    @override_settings(SYNC_TOMBSTONE_RETENTION_DAYS=30)
+    def test_purge_drops_expired_tombstones(self):
+        old = Tombstone.objects.create(user=self.user, kind='tasks', object_id=self.task.pk)
+        Tombstone.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=31))
+        Tombstone.objects.create(user=self.user, kind='tasks', object_id=self.subtask.pk)
+
+        self.assertEqual(purge_tombstones(), 1)
+        self.assertEqual(Tombstone.objects.count(), 1)
@@ -0,0 +1,65 @@
+"""
+The hot task predicates are served by the partial indexes.
+
+Checked with EXPLAIN on PostgreSQL only, with sequential scans disabled, as
+a test table is too small for the planner to prefer an index on its own.
+SQLite can't match an ``IN (?, ?)`` with bound parameters against a partial
+index condition, so its plans say nothing about production.
+"""
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from apps.tasks.models import Task
+
+OPEN = ['todo', 'in_progress']
+
+
+@skipUnless(connection.vendor == 'postgresql', 'index plans are checked on PostgreSQL')
+class TaskIndexPlanTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='plans@example.com', username='plans', password='pass1234',
+        )
+        now = timezone.now()
+        Task.objects.bulk_create(
+            Task(
+                user=cls.user, title=f'Task {i}', status=('todo', 'in_progress', 'done')[i % 3],
+                due_date=now + timedelta(hours=i - 100), completed_at=now - timedelta(hours=i) if i % 3 == 2 else None,
+            )
+            for i in range(300)
+        )
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE tasks')
+            cursor.execute('SET LOCAL enable_seqscan = off')
+
+    def assertUsesIndex(self, queryset, name):
+        plan = queryset.explain()
+        self.assertIn(name, plan, plan)
+
+    def test_open_tasks_by_due_date(self):
+        now = timezone.now()
+        overdue = Task.objects.filter(user=self.user, status__in=OPEN, due_date__lt=now)
+        self.assertUsesIndex(overdue, 'tasks_open_due_idx')
+        at_risk = Task.objects.filter(user=self.user, status__in=OPEN, due_date__range=[now, now + timedelta(days=2)])
+        self.assertUsesIndex(at_risk, 'tasks_open_due_idx')
+
+    def test_done_tasks_by_completion_time(self):
+        now = timezone.now()
+        done = Task.objects.filter(
+            user=self.user, status='done', completed_at__gte=now - timedelta(days=1), completed_at__lt=now,
+        )
+        self.assertUsesIndex(done, 'tasks_done_completed_idx')
+
+    def test_cross_user_sweep(self):
+        now = timezone.now()
+        sweep = Task.objects.filter(status__in=OPEN, due_date__range=[now, now + timedelta(hours=1)])
+        self.assertUsesIndex(sweep, 'tasks_status_due_idx')
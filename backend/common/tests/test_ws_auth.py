@@ -0,0 +1,57 @@
+"""
+WebSocket JWT auth: the per-process user cache is invalidated through the
+user's version in the shared cache.
+"""
+from unittest import mock
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.notifications import middleware
+from apps.notifications.middleware import get_user, user_cache
+from apps.tasks.models import Task
+
+
+class WebSocketUserCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user(
+            email='socket@example.com', username='socket', password='pass1234',
+        )
+
+    def setUp(self):
+        cache.clear()
+        user_cache.clear()
+        self.token = str(AccessToken.for_user(self.user))
+
+    def connect(self):
+        return async_to_sync(get_user)(self.token)
+
+    def test_repeat_connections_skip_the_users_table(self):
+        with mock.patch.object(middleware, '_load_user', wraps=middleware._load_user) as load:
+            self.assertEqual(self.connect(), self.user)
+            self.assertEqual(self.connect(), self.user)
+        self.assertEqual(load.call_count, 1)
+
+    def test_task_writes_keep_the_cached_user(self):
+        self.connect()
+        with mock.patch.object(middleware, '_load_user') as load:
+            with self.captureOnCommitCallbacks(execute=True):
+                Task.objects.create(user=self.user, title='Unrelated write')
+            self.assertEqual(self.connect(), self.user)
+        load.assert_not_called()
+
+    def test_user_change_invalidates_entries_in_every_process(self):
+        self.connect()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        # The local entry is still there, as it would be in the WebSocket
+        # process; the bumped shared version is what turns it away.
+        self.assertEqual(len(user_cache), 1)
+        self.assertFalse(self.connect().is_authenticated)
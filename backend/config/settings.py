@@ -32,6 +32,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     # Third-party
     'rest_framework',
     'rest_framework_simplejwt',
@@ -47,6 +48,7 @@ INSTALLED_APPS = [
     'apps.analytics',
     'apps.notifications',
     'apps.chatbot',
+    'apps.sync',
 ]
 
 # ─── Middleware ─────────────────────────────────────────────
@@ -181,6 +183,24 @@ else:
         }
     }
 
+# ─── Cache ─────────────────────────────────────────────────
+# Shared Redis cache in production so every worker sees the same per-user
+# versions; process-local memory is enough for development.
+if _REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': _REDIS_URL,
+            'KEY_PREFIX': 'flowstate',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # ─── Celery ────────────────────────────────────────────────
 CELERY_BROKER_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
@@ -188,6 +208,9 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'UTC'
+NOTIFICATION_SWEEP_SHARDS = int(os.getenv('NOTIFICATION_SWEEP_SHARDS', '8'))
+# Clients offline for longer than this get a full snapshot instead of a delta.
+SYNC_TOMBSTONE_RETENTION_DAYS = int(os.getenv('SYNC_TOMBSTONE_RETENTION_DAYS', '30'))
 
 from celery.schedules import crontab
 CELERY_BEAT_SCHEDULE = {
@@ -199,6 +222,14 @@ CELERY_BEAT_SCHEDULE = {
         'task': 'apps.notifications.tasks.send_upcoming_reminders',
         'schedule': crontab(minute=30),
     },
+    'repair-daily-stats': {
+        'task': 'apps.analytics.tasks.rebuild_daily_stats',
+        'schedule': crontab(minute=15, hour=3),
+    },
+    'purge-sync-tombstones': {
+        'task': 'apps.sync.tasks.purge_tombstones',
+        'schedule': crontab(minute=45, hour=3),
+    },
 }
 
 # ─── Email ─────────────────────────────────────────────────
@@ -227,3 +258,4 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # ─── AI Chatbot ────────────────────────────────────────────
 GEMINI_API_KEY = os.getenv('GEMINI_API_KEY', '')
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
+GROQ_API_URL = os.getenv('GROQ_API_URL', 'https://api.groq.com/openai/v1/chat/completions')
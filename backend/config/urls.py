@@ -15,10 +15,12 @@ urlpatterns = [
     path('api/projects/', include('apps.tasks.urls_projects')),
     path('api/tasks/', include('apps.tasks.urls_tasks')),
     path('api/subtasks/', include('apps.tasks.urls_subtasks')),
+    path('api/search/', include('apps.tasks.urls_search')),
     path('api/schedule/', include('apps.schedule.urls')),
     path('api/focus/', include('apps.focus.urls')),
     path('api/habits/', include('apps.habits.urls')),
     path('api/analytics/', include('apps.analytics.urls')),
     path('api/notifications/', include('apps.notifications.urls')),
     path('api/chatbot/', include('apps.chatbot.urls')),
+    path('api/sync/', include('apps.sync.urls')),
 ]
@@ -35,6 +35,7 @@ export const tasksAPI = {
   complete: (id) => client.post(`/tasks/${id}/complete/`),
   quickCapture: (data) => client.post('/tasks/quick-capture/', data),
   reorder: (items) => client.patch('/tasks/reorder/', { items }),
+  move: (id, { after = null, before = null } = {}) => client.post(`/tasks/${id}/move/`, { after, before }),
   aiBreakdown: (id) => client.post(`/tasks/${id}/ai-breakdown/`),
 };
 
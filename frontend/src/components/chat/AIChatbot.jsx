@@ -12,6 +12,7 @@ const SUGGESTIONS = [
 ];
 
 const SESSION_KEY = 'flowstate_chat_history';
+const CONVERSATION_KEY = 'flowstate_chat_conversation';
 
 // ── Inline markdown renderer ──────────────────────────────────────────────────
 // Handles: **bold**, `code`, ## headers, bullet lists, numbered lists, line breaks
@@ -156,10 +157,17 @@ export default function AIChatbot() {
         setIsLoading(true);
 
         try {
-            const history = updatedMessages.slice(0, -1).map(m => ({ role: m.role, content: m.content }));
-            const { data } = await client.post('/chatbot/', { message: userMessage, history });
+            // History lives server-side; only the new message is sent
+            const conversationId = sessionStorage.getItem(CONVERSATION_KEY);
+            const { data } = await client.post('/chatbot/', {
+                message: userMessage,
+                ...(conversationId && { conversation_id: conversationId }),
+            });
+            sessionStorage.setItem(CONVERSATION_KEY, data.conversation_id);
             setMessages(prev => [...prev, { role: 'assistant', content: data.reply }]);
         } catch (err) {
+            // The conversation was deleted elsewhere; the next message starts a new one
+            if (err.response?.status === 404) sessionStorage.removeItem(CONVERSATION_KEY);
             const errorMsg = err.response?.data?.error || 'Something went wrong. Please try again.';
             setMessages(prev => [...prev, { role: 'error', content: errorMsg }]);
         } finally {
@@ -170,6 +178,7 @@ export default function AIChatbot() {
     const clearHistory = () => {
         setMessages([]);
         sessionStorage.removeItem(SESSION_KEY);
+        sessionStorage.removeItem(CONVERSATION_KEY);
     };
 
     return (